@@ -0,0 +1,260 @@
+import asyncio
+import dataclasses
+import functools
+import heapq
+import inspect
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from loguru import logger
+
+from app.settings import settings
+from app.singleflight import SingleFlight
+from app.quota import quota
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry TTL and LRU eviction.
+
+    Keys are tuples whose first element is the namespace (e.g. the crawler
+    source); hit/miss counters are tracked per namespace.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "stale": 0}
+        )
+        self.evictions = 0
+
+    @staticmethod
+    def _namespace(key: Hashable) -> str:
+        return str(key[0]) if isinstance(key, tuple) and key else "default"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        counters = self._counters[self._namespace(key)]
+        entry = self._data.get(key)
+
+        if entry is None:
+            counters["misses"] += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            # Expired entries stay until evicted so they can be served stale
+            counters["misses"] += 1
+            return default
+
+        self._data.move_to_end(key)
+        counters["hits"] += 1
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the live entry for key without touching LRU order or counters."""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Seconds until key's entry expires (negative once expired), None if absent."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        return entry[0] - time.monotonic()
+
+    def record(self, key: Hashable, outcome: str) -> None:
+        """Count a hit or miss for key's namespace decided outside ``get``."""
+        self._counters[self._namespace(key)][outcome] += 1
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Return the entry for key even if it has expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        self._counters[self._namespace(key)]["stale"] += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "sources": {ns: dict(c) for ns, c in self._counters.items()},
+        }
+
+
+class CallRegistry:
+    """
+    Recently requested upstream calls and how to re-issue them.
+
+    Each call carries a weight that grows with every request and decays over
+    time, so ``hottest()`` reflects recent traffic. The prefetch scheduler
+    uses it to refresh popular charts before they expire.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._calls: OrderedDict[Hashable, list] = OrderedDict()
+
+    def record(self, key: Hashable, refresh: Callable[[], Awaitable[Any]]) -> None:
+        entry = self._calls.get(key)
+        if entry is None:
+            self._calls[key] = [1.0, refresh]
+        else:
+            entry[0] += 1.0
+            entry[1] = refresh
+        self._calls.move_to_end(key)
+
+        while len(self._calls) > self.max_entries:
+            self._calls.popitem(last=False)
+
+    def hottest(self, n: int) -> list[tuple[Hashable, Callable[[], Awaitable[Any]]]]:
+        top = heapq.nlargest(n, self._calls.items(), key=lambda item: item[1][0])
+        return [(key, refresh) for key, (_, refresh) in top]
+
+    def decay(self, factor: float, floor: float = 0.05) -> None:
+        for key in list(self._calls):
+            self._calls[key][0] *= factor
+            if self._calls[key][0] < floor:
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+crawl_cache = TTLCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    default_ttl=settings.CACHE_DEFAULT_TTL
+)
+crawl_flight = SingleFlight()
+crawl_calls = CallRegistry(max_entries=settings.CACHE_MAX_ENTRIES)
+
+# Cleared while the prefetch warm-up runs so it does not count as traffic
+_record_calls: ContextVar[bool] = ContextVar("record_calls", default=True)
+
+# Coroutines handed every freshly crawled (non-cached) result, e.g. the
+# trend store; they run in the background so responses do not wait on them
+crawl_listeners: list[Callable[[list[Any]], Awaitable[None]]] = []
+_listener_tasks: set[asyncio.Task] = set()
+
+# Upstream bodies with their ETag/Last-Modified validators, keyed by
+# (host, url, params); a 304 on revalidation counts as a hit
+response_cache = TTLCache(
+    max_entries=settings.HTTP_CACHE_MAX_ENTRIES,
+    default_ttl=settings.HTTP_CACHE_TTL
+)
+
+
+@contextmanager
+def untracked():
+    """Keep cached calls made in this context out of ``crawl_calls``."""
+    token = _record_calls.set(False)
+    try:
+        yield
+    finally:
+        _record_calls.reset(token)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Make list/set arguments usable as part of a cache key."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted(str(v) for v in value))
+    return value
+
+
+def _notify(result: list[Any]) -> None:
+    for listener in crawl_listeners:
+        task = asyncio.create_task(listener(result))
+        _listener_tasks.add(task)
+        task.add_done_callback(_listener_tasks.discard)
+
+
+def _retag(posts: list[Any], tags: Any) -> list[Any]:
+    """Give cached posts the tags of the current caller."""
+    if not tags or isinstance(tags, str):
+        return list(posts)
+    tags = sorted(set(tags))
+    return [dataclasses.replace(post, tags=tags) for post in posts]
+
+
+def cached(source: str, key: tuple[str, ...], retag: bool = True):
+    """
+    Cache a crawler coroutine's result in ``crawl_cache``.
+
+    Args:
+        source: Cache namespace, also used to look up the TTL in
+                ``settings.CACHE_TTLS``
+        key: Names of the arguments that identify an upstream request
+        retag: Replace the tags of cached posts with the caller's ``tags``
+
+    Empty results are not cached so transient upstream failures are retried.
+    Concurrent misses for the same key share one upstream call through
+    ``crawl_flight``, and every call is recorded in ``crawl_calls`` so it
+    can be refreshed in the background. Fresh results are passed to
+    ``crawl_listeners``. When the source's quota runs low,
+    or the upstream call comes back empty, an expired entry is served
+    instead if one is still held.
+    """
+    ttl = settings.CACHE_TTLS.get(source)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache_key = (source, *(_freeze(bound.arguments.get(name)) for name in key))
+
+            tags = bound.arguments.get("tags")
+
+            async def fetch() -> list[Any]:
+                result = await func(*args, **kwargs)
+                if result:
+                    crawl_cache.set(cache_key, list(result), ttl)
+                    _notify(list(result))
+                return result
+
+            if _record_calls.get():
+                crawl_calls.record(cache_key, lambda: crawl_flight.do(cache_key, fetch))
+
+            hit = crawl_cache.get(cache_key, _MISSING)
+            if hit is _MISSING and quota.is_low(source):
+                hit = crawl_cache.get_stale(cache_key, _MISSING)
+            if hit is not _MISSING:
+                logger.debug(f"Cache hit for {cache_key}")
+                return _retag(hit, tags) if retag else list(hit)
+
+            result = await crawl_flight.do(cache_key, fetch)
+            if not result:
+                result = crawl_cache.get_stale(cache_key, result)
+            return _retag(result, tags) if retag else list(result)
+
+        return wrapper
+
+    return decorator
@@ -259,6 +259,50 @@ TAG_MAPPINGS: Dict[str, List[CrawlerMapping]] = {
 }
 
 
+# Free-text aliases (English and Vietnamese) for each routable tag, used by
+# app.tools.tag_resolver to map a user's interest to tags without an LLM.
+# Accent-less input matches the folded form of multi-word aliases only, since
+# folding single Vietnamese syllables is ambiguous (bão/báo, chó/cho).
+TAG_ALIASES: Dict[str, List[str]] = {
+    "movies": ["movie", "film", "films", "cinema", "trailer", "phim", "phim chiếu rạp", "điện ảnh", "rạp chiếu phim"],
+    "music": ["song", "songs", "album", "singer", "concert", "kpop", "vpop", "rap", "nhạc", "âm nhạc", "bài hát", "ca sĩ", "ca nhạc"],
+    "entertainment": ["showbiz", "celebrity", "celebrities", "tv show", "gameshow", "giải trí", "người nổi tiếng", "sao việt"],
+    "comedy": ["funny", "humor", "humour", "joke", "jokes", "hài hước", "phim hài", "vui nhộn", "tiểu phẩm"],
+    "technology": ["tech", "gadget", "gadgets", "smartphone", "iphone", "laptop", "software", "công nghệ", "điện thoại", "máy tính", "phần mềm"],
+    "ai": ["artificial intelligence", "chatgpt", "llm", "llms", "gpt", "trí tuệ nhân tạo"],
+    "machine_learning": ["ml", "machine learning", "deep learning", "neural network", "neural networks", "học máy", "học sâu"],
+    "nlp": ["natural language processing", "language model", "language models", "xử lý ngôn ngữ tự nhiên", "mô hình ngôn ngữ"],
+    "computer_vision": ["computer vision", "image recognition", "object detection", "thị giác máy tính", "nhận diện hình ảnh"],
+    "model": ["models", "checkpoint", "checkpoints", "mô hình"],
+    "dataset": ["datasets", "data set", "bộ dữ liệu", "tập dữ liệu"],
+    "paper": ["papers", "research", "arxiv", "bài báo khoa học", "nghiên cứu"],
+    "gaming": ["game", "games", "gamer", "esports", "esport", "trò chơi", "chơi game", "liên quân"],
+    "sports": ["sport", "football", "soccer", "tennis", "world cup", "bóng đá", "thể thao", "cầu thủ"],
+    "education": ["school", "university", "exam", "exams", "giáo dục", "trường học", "đại học", "tuyển sinh", "học sinh"],
+    "tutorial": ["how to", "howto", "guide", "guides", "hướng dẫn", "cách làm"],
+    "science": ["scientific", "physics", "biology", "chemistry", "space", "khoa học", "vũ trụ"],
+    "politics": ["political", "government", "election", "elections", "chính trị", "chính phủ", "bầu cử", "quốc hội"],
+    "politician": ["president", "minister", "prime minister", "senator", "chính trị gia", "tổng thống", "thủ tướng", "bộ trưởng"],
+    "news": ["headline", "headlines", "breaking", "tin tức", "thời sự", "tin nóng", "báo chí", "bản tin"],
+    "health": ["medical", "disease", "covid", "fitness", "sức khỏe", "sức khoẻ", "y tế", "dịch bệnh", "bác sĩ", "bệnh"],
+    "business": ["company", "companies", "startup", "startups", "economy", "kinh doanh", "doanh nghiệp", "kinh tế", "công ty"],
+    "finance": ["stock", "stocks", "crypto", "bitcoin", "gold price", "bank", "banking", "tài chính", "chứng khoán", "giá vàng", "tiền điện tử", "ngân hàng", "lãi suất"],
+    "food": ["recipe", "recipes", "cooking", "restaurant", "restaurants", "ẩm thực", "món ăn", "nấu ăn", "đồ ăn", "quán ăn"],
+    "travel": ["tourism", "trip", "vacation", "hotel", "du lịch", "khách sạn", "phượt"],
+    "fashion": ["clothes", "beauty", "makeup", "style", "thời trang", "làm đẹp", "mỹ phẩm"],
+    "climate": ["weather", "storm", "typhoon", "hurricane", "flood", "floods", "environment", "global warming", "khí hậu", "thời tiết", "bão", "cơn bão", "lũ lụt", "môi trường"],
+    "animals": ["animal", "wildlife", "động vật", "thế giới động vật"],
+    "pets": ["pet", "dog", "dogs", "cat", "cats", "puppy", "kitten", "thú cưng", "con chó", "con mèo", "chó mèo"],
+    "discussion": ["discuss", "debate", "opinion", "opinions", "thảo luận", "bàn luận", "ý kiến"],
+    "community": ["forum", "forums", "group", "cộng đồng", "diễn đàn"],
+    "social": ["social media", "viral", "facebook", "tiktok", "mạng xã hội"],
+    "meme": ["memes", "troll", "ảnh chế"],
+    "ask": ["question", "questions", "câu hỏi", "hỏi đáp"],
+    "video": ["videos", "clip", "clips", "youtube"],
+    "vlog": ["vlogs", "vlogger", "daily vlog"],
+    "channel": ["channels", "youtuber", "youtubers", "kênh"],
+}
+
 def get_predefined_tags_prompt() -> str:
     """
     Generate a prompt for LLMs to return only predefined tags.
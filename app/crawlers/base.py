@@ -1,20 +1,45 @@
 import aiohttp
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional, Any
+from urllib.parse import urlsplit
 from loguru import logger
 import asyncio
 
-from bs4 import BeautifulSoup as BS
+from bs4 import BeautifulSoup as BS, SoupStrainer
+from app.settings import settings
+from app.ratelimit import host_limiters
+from app.quota import quota
+from app.resilience import circuit_breakers, parse_retry_after, backoff_delay
+from app.cache import TTLCache, response_cache
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    _HAS_LXML = True
+except ImportError:
+    _HAS_LXML = False
 
 
 class BaseAsyncRequest(ABC):
+    # Quota source charged for each request, see app.quota
+    quota_source: Optional[str] = None
+
     def __init__(self,
                 url: str,
                 headers: dict[str, str]):
         
         self.url = url
         self.headers = headers
-        self._session = None
+        self._session: Optional[aiohttp.ClientSession] = None
 
     def set_content_type(self, content_type: str) -> None:
         self.default_content_type = content_type
@@ -24,21 +49,46 @@ class BaseAsyncRequest(ABC):
         """
         Construct the full endpoint URL.
         """
+        # Absolute URLs are requested as-is
+        if path.startswith(("http://", "https://")):
+            return path
+
         # Ensure path starts with / if not empty
         if path and not path.startswith("/"):
             path = f"/{path}"
             
         return f"{self.url}{path}"
         
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        """
+        Build the pooled connector backing this crawler's session.
+        """
+        return aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        )
+
     async def _get_session(self) -> aiohttp.ClientSession:
         """
         Get or create the aiohttp session.
+
+        The session is created lazily on first use and reused for every
+        request so connections, DNS lookups and TLS handshakes are pooled.
         """
-        return aiohttp.ClientSession(headers=self.headers)
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=self._create_connector()
+            )
+        return self._session
     
     async def close(self):
         """Close the aiohttp session."""
-        pass
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def __aenter__(self):
         """Support for async context manager."""
@@ -48,6 +98,31 @@ class BaseAsyncRequest(ABC):
         """Support for async context manager."""
         await self.close()
     
+    @staticmethod
+    def _response_key(host: str, url: str, params: Optional[dict[str, Any]]) -> tuple:
+        return (host, url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+    @staticmethod
+    def _conditional_headers(stored: Optional[tuple]) -> dict[str, str]:
+        """Validators from a stored response, sent so unchanged pages come back as 304."""
+        if stored is None:
+            return {}
+        etag, last_modified, _ = stored
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    @staticmethod
+    def _store_response(cache_key: tuple, response: aiohttp.ClientResponse, result: dict[str, Any]) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified) or "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        response_cache.set(cache_key, (etag, last_modified, result))
+
     async def _request(
         self,
         method: str,
@@ -65,37 +140,86 @@ class BaseAsyncRequest(ABC):
 
         session = await self._get_session()
         url = self._get_full_endpoint(path)
+        host = urlsplit(url).hostname or ""
+        breaker = circuit_breakers.for_host(host)
         
         # Use custom headers for this request if provided, otherwise use default headers
         request_headers = headers if headers is not None else self.headers
-        
-        logger.debug(f"Making {method} request to {url}")
-        
-        try:
-            async with session.request(method,
-                                    url,
-                                    json = json,
-                                    data=data,
-                                    params=params,
-                                    timeout=timeout,
-                                    headers = request_headers) as response:
-                response.raise_for_status()
-
-                if response.content_type == 'application/json':
-                    return await response.json()
-                else:
-                    text = await response.text()
-                    return {"response": text}
-        except aiohttp.ClientResponseError as e:
-            logger.error(f"Request failed with status {e.status}: {e.message}")
-            raise e
-        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-            logger.error(f"Request error: {str(e)}")
-            raise e
-        finally:
-            # cleaning after each request
-            if session and not session.closed:
-                await session.close()
+
+        # GET responses carrying validators are stored and revalidated
+        cache_key = self._response_key(host, url, params) if method == "GET" else None
+
+        # Only idempotent requests are safe to send again
+        retries = settings.HTTP_MAX_RETRIES if method in IDEMPOTENT_METHODS else 0
+
+        for attempt in range(retries + 1):
+            await host_limiters.acquire(host)
+            # Fail fast while the upstream is known to be down
+            breaker.before_call()
+            retry_after = None
+
+            try:
+                quota.charge(self.quota_source, (params or {}).get("engine") or path)
+
+                stored = response_cache.peek(cache_key) if cache_key else None
+                conditional = self._conditional_headers(stored)
+
+                logger.debug(f"Making {method} request to {url}")
+                async with session.request(method,
+                                        url,
+                                        json = json,
+                                        data=data,
+                                        params=params,
+                                        timeout=timeout,
+                                        headers = {**request_headers, **conditional}) as response:
+                    if response.status == 304 and stored is not None:
+                        # Unchanged upstream, reuse the stored body and extend its lifetime
+                        logger.debug(f"Not modified: {url}")
+                        response_cache.record(cache_key, "hits")
+                        response_cache.set(cache_key, stored)
+                        result = stored[2]
+                    else:
+                        if response.status in RETRYABLE_STATUSES:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        response.raise_for_status()
+
+                        if response.content_type == 'application/json':
+                            result = await response.json()
+                        else:
+                            text = await response.text()
+                            result = {"response": text}
+
+                        if cache_key is not None:
+                            response_cache.record(cache_key, "misses")
+                            self._store_response(cache_key, response, result)
+                breaker.record_success()
+                return result
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRYABLE_STATUSES:
+                    # The upstream answered, the request itself is wrong
+                    breaker.record_success()
+                    logger.error(f"Request failed with status {e.status}: {e.message}")
+                    raise e
+                breaker.record_failure()
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                error = e
+            except BaseException:
+                # Cancelled by a source deadline, refused by the quota, ...:
+                # a half-open trial must not stay pending forever
+                breaker.record_abandoned()
+                raise
+
+            delay = backoff_delay(attempt, settings.HTTP_BACKOFF_BASE, settings.HTTP_BACKOFF_MAX)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            if attempt == retries or delay > settings.HTTP_BACKOFF_MAX:
+                logger.error(f"Request error: {error}")
+                raise error
+
+            logger.warning(f"Request to {url} failed ({error!r}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
 
     
     async def get(self, path: str = "", params: dict[str, Any] = None, headers: Optional[dict[str, str]] = None, timeout: float = 30.0) -> dict[str, Any]:
@@ -116,28 +240,89 @@ class BaseAsyncRequest(ABC):
 
 class MyDummyClass(BaseAsyncRequest):
     def __init__(self, url: str, headers: dict):
-        self.url = url
-        self.headers = headers
+        super().__init__(url, headers)
 
     async def health_check(self):
         return await super().health_check()
 
+def _resolve_parser(preferred: str) -> str:
+    """Pick the fastest available HTML backend unless one is configured."""
+    if preferred == "selectolax" and LexborHTMLParser is None:
+        logger.warning("selectolax is not installed, falling back to another parser")
+        preferred = "auto"
+    if preferred == "lxml" and not _HAS_LXML:
+        logger.warning("lxml is not installed, falling back to html.parser")
+        preferred = "html.parser"
+    if preferred != "auto":
+        return preferred
+    if LexborHTMLParser is not None:
+        return "selectolax"
+    return "lxml" if _HAS_LXML else "html.parser"
+
+
+def extract_first_text(html: str, tag: str, class_contains: str, parser: str) -> str | None:
+    """
+    Return the text of the first ``tag`` element whose class contains
+    ``class_contains``, without building more of the document than needed.
+    """
+    if parser == "selectolax":
+        node = LexborHTMLParser(html).css_first(f'{tag}[class*="{class_contains}"]')
+        return node.text(strip=True) if node is not None else None
+
+    # Only materialize the matching tags instead of the whole tree
+    soup = BS(html, parser, parse_only=SoupStrainer(tag))
+    element = soup.find(tag, class_=lambda x: x and class_contains in x)
+    return element.get_text(strip=True) if element is not None else None
+
+
+# Parsing is CPU bound, keep it off the event loop
+_parse_executor = ThreadPoolExecutor(
+    max_workers=settings.HTML_PARSE_WORKERS,
+    thread_name_prefix="html-parse"
+)
+
+
 class BaseHTMLRequest:
 
-    def _initialize(self):
-        return MyDummyClass
+    parser = _resolve_parser(settings.HTML_PARSER)
+
+    def __init__(self):
+        self._requester: Optional[MyDummyClass] = None
+        # Parsed text per (page, class), reused while the page body is unchanged
+        self._parsed = TTLCache(
+            max_entries=settings.HTTP_CACHE_MAX_ENTRIES,
+            default_ttl=settings.HTTP_CACHE_TTL
+        )
+
+    def _initialize(self) -> MyDummyClass:
+        """Reuse one requester (and its pooled session) for every page."""
+        if self._requester is None:
+            self._requester = MyDummyClass("", {})
+        return self._requester
+
+    async def close(self):
+        if self._requester is not None:
+            await self._requester.close()
 
     async def find_one(self, page_url: str, xpath_contains: str) -> str | None:
         try:
 
-            MyDummyClass = self._initialize()
-            requester = MyDummyClass(page_url, {})
+            requester = self._initialize()
+
+            html = (await requester.get(page_url)).get('response')
+            key = ("parsed", page_url, xpath_contains)
+            parsed = self._parsed.peek(key)
+            if parsed is not None and parsed[0] is html:
+                # 304 revalidation handed back the same body, skip parsing
+                return parsed[1]
 
-            html_content = await requester.get()
-            soup = BS(html_content.get('response'), 'html.parser')
-            elements = soup.find_all('p', class_=lambda x: x and xpath_contains in x)
-            texts = [el.get_text(strip=True) for el in elements]
-            return texts[0] if texts else None
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(
+                _parse_executor,
+                partial(extract_first_text, html, 'p', xpath_contains, self.parser)
+            )
+            self._parsed.set(key, (html, text))
+            return text
         except Exception as e:
             logger.warning(f"Parsing get error: {e}")
             return None
\ No newline at end of file
@@ -4,16 +4,25 @@ import asyncio
 
 from .base import BaseAsyncRequest, BaseHTMLRequest
 from app.const.url import HUGGINGFACE
-from app.schemas.posts import BasePost, HFPost
+from app.schemas.records import PostRecord
+from app.cache import cached
+from app.settings import settings
 
 class HuggingFaceCrawler(BaseAsyncRequest):
     def __init__(self):
         super().__init__(HUGGINGFACE, {})
         self.parser = BaseHTMLRequest()
+        self._scrape_semaphore = asyncio.Semaphore(settings.HF_SCRAPE_CONCURRENCY)
 
-    async def get_trending_papers(self, tags: list[str] = ['paper']) -> List[Dict]:
+    @cached("hf", key=("limit",))
+    async def get_trending_papers(self,
+                                  tags: list[str] = ['paper'],
+                                  limit: int = settings.HF_PAPERS_LIMIT) -> List[Dict]:
         """
-        Get trending models from Hugging Face
+        Get today's trending papers from Hugging Face.
+
+        Paper pages are scraped concurrently, at most
+        settings.HF_SCRAPE_CONCURRENCY at a time.
         """
         url = "https://huggingface-paper-explorer.vercel.app/api/papers?timeFrame=today"
         
@@ -23,25 +32,28 @@ class HuggingFaceCrawler(BaseAsyncRequest):
                 path="papers?timeFrame=today",
             )
             
+            papers = response[:limit]
+            contents = await asyncio.gather(
+                *(self._scrape(paper.get("link")) for paper in papers)
+            )
+
             trending_list = []
-            for paper in response[:3]:
+            for paper, content in zip(papers, contents):
                 paper_url = paper.get("link")
-                content = await self.get_paper_content(paper_url)
-                trending_list.append(BasePost(
+                trending_list.append(PostRecord(
                     source = "hf",
                     uid=paper_url.split("/")[-1],
                     title=paper.get("title"),
                     url = paper_url,
                     author=paper.get("submittedBy"),
                     content=content,
-                    metadata_=HFPost(
-                        thumbnail=paper.get("image"),
-                        upvotes=paper.get("upvotes")
-                    ),
-                    tags=set(tags)
+                    metadata={
+                        "thumbnail": paper.get("image"),
+                        "upvotes": int(paper.get("upvotes") or 0)
+                    },
+                    tags=sorted(set(tags))
                 ),
                 )
-                await asyncio.sleep(0.5)
             return trending_list
         
         except requests.exceptions.RequestException as e:
@@ -50,6 +62,14 @@ class HuggingFaceCrawler(BaseAsyncRequest):
         
     async def health_check(self):
         return await super().health_check()
+
+    async def close(self):
+        await super().close()
+        await self.parser.close()
     
+    async def _scrape(self, paper_url: str) -> str:
+        async with self._scrape_semaphore:
+            return await self.get_paper_content(paper_url)
+
     async def get_paper_content(self,paper_url: str) -> str:
         return await self.parser.find_one(paper_url, 'text-blue')
\ No newline at end of file
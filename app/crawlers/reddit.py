@@ -1,7 +1,9 @@
 import asyncpraw
+import asyncio
 from datetime import datetime
 from app.settings import settings
-from app.schemas.posts import BasePost, RedditPost
+from app.schemas.records import PostRecord
+from app.cache import cached
 from loguru import logger
 
 class RedditTrendingCrawler:
@@ -22,6 +24,35 @@ class RedditTrendingCrawler:
                 logger.error(f"Failed to initialize Reddit client: {e}")
                 raise e
     
+    async def close(self):
+        """Close the Reddit client and its HTTP session."""
+        if self.reddit is not None:
+            await self.reddit.close()
+            self.reddit = None
+
+    @staticmethod
+    def _to_post(post, tags: list[str]) -> PostRecord:
+        return PostRecord(
+            source="reddit",
+            title=post.title,
+            uid=post.id,
+            content=post.selftext,
+            url=post.url,
+            created_at=datetime.fromtimestamp(post.created_utc),
+            author=post.subreddit.display_name,
+            metadata={
+                "permalink": f"https://reddit.com{post.permalink}",
+                "upvote_ratio": post.upvote_ratio,
+                "score": post.score
+            },
+            tags=sorted(set(tags))
+        )
+
+    @staticmethod
+    def _score(post: PostRecord) -> int:
+        return (post.metadata or {}).get("score") or 0
+
+    @cached("reddit", key=("subreddit_name", "limit", "time_filter"))
     async def get_trending_posts(self, subreddit_name='all', limit=50, time_filter='day', tags: list[str] = ['thread']) -> list[dict]:
         """
         Fetch trending posts from a Reddit subreddit.
@@ -41,26 +72,52 @@ class RedditTrendingCrawler:
             trending_posts = []
             
             async for post in subreddit.top(time_filter=time_filter, limit=limit):
-                trending_posts.append(
-                    BasePost(
-                        source="reddit",
-                        title=post.title,
-                        uid=post.id,
-                        content=post.selftext,
-                        url=post.url,
-                        created_at=datetime.fromtimestamp(post.created_utc),
-                        author=post.subreddit.display_name,
-                        metadata=RedditPost(
-                            permalink=f"https://reddit.com{post.permalink}",
-                            upvote_ratio=post.upvote_ratio
-                        ),
-                        tags=set(tags)
-                    )
-                )            
+                trending_posts.append(self._to_post(post, tags))
             return trending_posts
         except Exception as e:
             print(f"Error fetching trending posts from r/{subreddit_name}: {e}")
             return []
-    
-    
 
+    @cached("reddit", key=("subreddit_names", "limit", "time_filter", "combined"))
+    async def get_trending_posts_batch(self,
+                                       subreddit_names: list[str],
+                                       limit: int = 50,
+                                       time_filter: str = 'day',
+                                       tags: list[str] = ['thread'],
+                                       combined: bool = True) -> list[PostRecord]:
+        """
+        Fetch top posts for several subreddits and merge them by score.
+
+        Args:
+            subreddit_names: Subreddits to fetch from
+            limit: Number of posts to return overall
+            time_filter: Time filter - 'day', 'week', 'month', 'year', 'all'
+            combined: Use a single combined ``a+b+c`` listing. Falls back to
+                      concurrent per-subreddit listings if that request fails.
+
+        Returns:
+            Posts from all subreddits, highest score first
+        """
+        names = list(dict.fromkeys(name.lower() for name in subreddit_names))
+        if not names:
+            return []
+
+        if combined:
+            try:
+                await self._initialize_reddit()
+
+                subreddit = await self.reddit.subreddit("+".join(names))
+                posts = [
+                    self._to_post(post, tags)
+                    async for post in subreddit.top(time_filter=time_filter, limit=limit)
+                ]
+                return sorted(posts, key=self._score, reverse=True)[:limit]
+            except Exception as e:
+                logger.warning(f"Combined listing for r/{'+'.join(names)} failed, fetching separately: {e}")
+
+        listings = await asyncio.gather(*(
+            self.get_trending_posts(subreddit_name=name, limit=limit, time_filter=time_filter, tags=tags)
+            for name in names
+        ))
+        merged = [post for listing in listings for post in listing]
+        return sorted(merged, key=self._score, reverse=True)[:limit]
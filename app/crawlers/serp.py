@@ -1,36 +1,58 @@
 from .base import BaseAsyncRequest
 from app.const.url import SERP
 from app.settings import settings
-from app.schemas.posts import BasePost, GoogleSearchMetadata
-from app.llm import LangchainDeepSeek
+from app.schemas.records import PostRecord
+from app.llm import LangchainDeepSeek, LLMResponseCache, BatchSummarizer
+from app.cache import cached
+from app.quota import quota
 from loguru import logger
 from datetime import datetime
+from typing import Any
 import asyncio
 
+summary_cache = LLMResponseCache(
+    ttl=settings.LLM_CACHE_TTL,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    path=settings.LLM_CACHE_PATH
+)
+
 summarizer = LangchainDeepSeek(
     api_key=settings.LLM_TOKEN,
-    name="deepseek/deepseek-r1"
+    name="deepseek/deepseek-r1",
+    cache=summary_cache
 )
+batch_summarizer = BatchSummarizer(summarizer)
 
 class SERPCrawler(BaseAsyncRequest):
+    quota_source = "serp"
+
     def __init__(self):
         super().__init__(SERP, {})
+        self._enrich_semaphore = asyncio.Semaphore(settings.SERP_ENRICH_CONCURRENCY)
     
-    async def get_trending_now(self, category_id: int | str, tags: list[str] = "trending") -> list[dict]:
+    # Post tags come from the trend's own categories, so cached posts keep them
+    @cached("serp", key=("category_id", "region_code", "limit"), retag=False)
+    async def get_trending_now(self,
+                               category_id: int | str,
+                               tags: list[str] = "trending",
+                               limit: int = settings.SERP_TRENDS_LIMIT,
+                               region_code: str = "VN") -> list[dict]:
         """
-        Perform a search query on SERP and return results.
+        Fetch Google trending searches and enrich each one with a news summary.
         
         Args:
-            query: Search query string
-            num_results: Number of results to return (default: 10)
+            category_id: Google Trends category id
+            tags: Fallback tags for trends without categories
+            limit: Number of trending searches to return and enrich
+            region_code: Google Trends geo, an ISO 3166-1 alpha-2 code
         
         Returns:
-            List of search results with metadata
+            List of trending searches with metadata
         """
         try:
             params = {
                 "engine": "google_trends_trending_now",
-                "geo":"VN",
+                "geo": region_code,
                 "hours": "24",
                 "category_id": category_id,
                 "api_key": settings.SERP_TOKEN
@@ -41,32 +63,64 @@ class SERPCrawler(BaseAsyncRequest):
                 params=params
                 )
             data = []
-            search_id = response.get("search_metadata", {}).get("id", "")
-            for item in response.get("trending_searches", [])[:5]:
-                news_supp = await self.get_trend_description(item.get("news_page_token"))
+            items = response.get("trending_searches", [])[:limit]
+            if quota.is_low(self.quota_source):
+                # Keep the remaining credits for the trend charts themselves
+                logger.warning("SERP quota is low, skipping news enrichment")
+                news = [{} for _ in items]
+            else:
+                news = await asyncio.gather(
+                    *(self._enrich(item.get("news_page_token")) for item in items)
+                )
+            # One completion describes every trend
+            descriptions = await batch_summarizer.summarize_many(
+                [news_supp.get("titles", []) for news_supp in news]
+            )
+            for item, news_supp, description in zip(items, news, descriptions):
                 categories = [i.get('name').lower() for i in item.get("categories", [])] or tags
+                start = item.get("start_timestamp")
 
-                data.append(BasePost(
+                data.append(PostRecord(
                     source="serp",
                     title=item.get("query"),
-                    uid=f"{search_id}_{item.get('start_timestamp')}",
+                    uid=self._trend_uid(region_code, item),
                     url=item.get(""),
                     author="",
-                    content=news_supp.get("start_timestamp", ""),
-                    tags=set(categories),
-                    created_at=datetime.fromtimestamp(item.get("start_timestamp", 0)),
-                    metadata_=GoogleSearchMetadata(thumbnail=news_supp.get("thumbnail", "")),
+                    content=description,
+                    tags=sorted(set(categories)),
+                    created_at=datetime.fromtimestamp(start) if start else None,
+                    metadata={"thumbnail": news_supp.get("thumbnail", "")},
                     ))
-                await asyncio.sleep(0.5)
             return data
         except Exception as e:
             logger.error(f"Error fetching SERP results: {e}")
             return []
     
+    @staticmethod
+    def _trend_uid(region_code: str, item: dict[str, Any]) -> str:
+        """Same trend, same uid across searches (the SerpAPI search id changes every time)."""
+        query = " ".join((item.get("query") or "").lower().split())
+        return f"{region_code.upper()}_{query}_{item.get('start_timestamp')}"
+
     async def health_check(self):
         return await super().health_check()
     
+    async def _enrich(self, news_page_token: str) -> dict[str, Any]:
+        """Fetch one trend's news, bounded by the enrichment concurrency limit."""
+        async with self._enrich_semaphore:
+            return await self.get_trend_news(news_page_token)
+
     async def get_trend_description(self, news_page_token: str) -> dict[str, str]:
+        news = await self.get_trend_news(news_page_token)
+        if not news:
+            return {}
+        return {
+            "content": await self.general_content(news["titles"]),
+            "thumbnail": news["thumbnail"]
+        }
+
+    async def get_trend_news(self, news_page_token: str) -> dict[str, Any]:
+        """Top news headlines and thumbnail for a trend."""
         try:
             params = {
                 "engine": "google_trends_news",
@@ -83,28 +137,13 @@ class SERPCrawler(BaseAsyncRequest):
             news_title = [i.get('title') for i in news[:5]]
             thumbnail = news[0].get('thumbnail') if news else ''
 
-
-            content = await self.general_content(news_title)
             return {
-                "content": content,
+                "titles": news_title,
                 "thumbnail": thumbnail
             }
         except Exception as e:
-            logger.error(f"Error summarizing content from SERP: {e}")
+            logger.error(f"Error fetching news from SERP: {e}")
             return {}
         
     async def general_content(self, content: list[str]) -> str:
-        try:
-            messages = [
-                {"role": "system",
-                "content": "Only return answer. no explain"},
-                {
-                "role": "user",
-                "content": f"Generate a short Vietnamese description for the following content: {content}"
-                }
-            ]
-            response = await summarizer.generate_response(messages)
-            return response
-        except Exception as e:
-            logger.error(f"Error summarizing content from SERP: {e}")
-            return ""
\ No newline at end of file
+        return await batch_summarizer.summarize(content)
\ No newline at end of file
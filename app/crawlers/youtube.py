@@ -2,12 +2,50 @@ import requests
 from app.settings import settings
 from .base import BaseAsyncRequest
 from app.const.url import YOUTUBE
-from app.schemas.posts import YoutubePost, BasePost
+from app.schemas.records import PostRecord
+from app.cache import cached
 from loguru import logger
 from datetime import datetime
+import asyncio
+from itertools import zip_longest
+
+
+# videos.list returns at most 50 items per page
+MAX_PAGE_SIZE = 50
+# Passes spent handing unused budget to categories that still have videos
+MAX_REBALANCE_ROUNDS = 2
+VIDEO_PARTS = "snippet,statistics"
+VIDEO_FIELDS = (
+    "nextPageToken,"
+    "items(id,"
+    "snippet(title,description,publishedAt,channelTitle,thumbnails/high/url),"
+    "statistics(viewCount,likeCount))"
+)
+
+
+def _allocate(total: int, buckets: int) -> list[int]:
+    """Split total into buckets that differ by at most one, larger first."""
+    if buckets <= 0:
+        return []
+    base, remainder = divmod(max(total, 0), buckets)
+    return [base + 1 if i < remainder else base for i in range(buckets)]
+
+
+def _interleave(groups: list[list[PostRecord]], limit: int) -> list[PostRecord]:
+    """Round-robin merge of per-category results, skipping repeated videos."""
+    seen = set()
+    merged = []
+    for row in zip_longest(*groups):
+        for post in row:
+            if post is not None and post.uid not in seen:
+                seen.add(post.uid)
+                merged.append(post)
+    return merged[:limit]
 
 
 class YoutubeTrendingCrawler(BaseAsyncRequest):
+    quota_source = "youtube"
+
     def __init__(self):
         headers = {}
         super().__init__(YOUTUBE, headers)
@@ -24,6 +62,7 @@ class YoutubeTrendingCrawler(BaseAsyncRequest):
             logger.error(f"YouTube health check failed: {e}")
             return {"status": "unhealthy", "service": "youtube", "error": str(e)}
 
+    @cached("youtube", key=("category_id", "region_code", "max_results"))
     async def get_trending_videos(self, region_code: str = 'VN',
                                   max_results: int = 5,
                                   category_id: int = None,
@@ -31,9 +70,12 @@ class YoutubeTrendingCrawler(BaseAsyncRequest):
         """
         Fetch trending videos from YouTube for a specific region.
         
+        Follows nextPageToken until max_results videos are collected and
+        only requests the fields that end up in the post.
+        
         Args:
-            region_code: ISO 3166-1 alpha-2 country code (default: 'US')
-            max_results: Number of videos to fetch (default: 10, max: 50)
+            region_code: ISO 3166-1 alpha-2 country code (default: 'VN')
+            max_results: Number of videos to fetch (default: 5)
             category_id: Optional YouTube category ID to filter results
         
         Returns:
@@ -41,45 +83,116 @@ class YoutubeTrendingCrawler(BaseAsyncRequest):
         """
 
         params = {
-            'part': 'snippet,contentDetails,statistics',
+            'part': VIDEO_PARTS,
+            'fields': VIDEO_FIELDS,
             'chart': 'mostPopular',
             'regionCode': region_code,
-            'maxResults': max_results,
             "key": settings.YOUTUBE_API_KEY,
-            "videoCategoryId": category_id
         }
+        if category_id:
+            params["videoCategoryId"] = category_id
         
         try:
-            response = await self.get(
-                "/videos",
-                params=params,
-                timeout=30.0
-            )
-
             trending_videos = []
-            for item in response.get('items', []):
-                trending_videos.append(
-                    BasePost(
-                        source="youtube",
-                        uid=item['id'],
-                        title=item['snippet']['title'],
-                        content=item['snippet']['description'],
-                        created_at=item['snippet']['publishedAt'],
-                        author=item['snippet']['channelTitle'],
-                        url=f"https://www.youtube.com/watch?v=${item['id']}",
-                        tags=set(tags),
-                        metadata_=YoutubePost(
-                            view_count=item['statistics'].get('viewCount', 0),
-                            like_count=item['statistics'].get('likeCount', 0),
-                            thumbnail=item['snippet']['thumbnails']['high']['url']
-                        ),
-                    )
+            page_token = None
+
+            while len(trending_videos) < max_results:
+                params["maxResults"] = min(max_results - len(trending_videos), MAX_PAGE_SIZE)
+                if page_token:
+                    params["pageToken"] = page_token
+
+                response = await self.get(
+                    "/videos",
+                    params=params,
+                    timeout=30.0
                 )
-            return trending_videos
+
+                for item in response.get('items', []):
+                    trending_videos.append(self._to_post(item, tags))
+
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+
+            return trending_videos[:max_results]
         
         except Exception as e:
             logger.warning(f"Cannot crawl youtube trending: {e}")
             return []
+
+    async def get_trending_by_categories(self,
+                                         category_ids: list[str],
+                                         region_code: str = 'VN',
+                                         max_results: int = 5,
+                                         tags: list[str] = ['top-chart']) -> list[PostRecord]:
+        """
+        Fetch trending videos across several categories concurrently.
+        
+        The result budget is split fairly between categories. Budget left over
+        by categories with fewer videos than their share (or none in this
+        region) is handed to the categories that filled theirs.
+        
+        Args:
+            category_ids: YouTube category IDs
+            region_code: ISO 3166-1 alpha-2 country code (default: 'VN')
+            max_results: Total number of videos to return
+        
+        Returns:
+            Videos interleaved across categories, without duplicates
+        """
+        allocation = dict(zip(category_ids, _allocate(max_results, len(category_ids))))
+        allocation = {category_id: n for category_id, n in allocation.items() if n > 0}
+
+        results = await self._fetch_allocation(allocation, region_code, tags)
+
+        for _ in range(MAX_REBALANCE_ROUNDS):
+            shortfall = max_results - sum(len(videos) for videos in results.values())
+            full = [c for c, n in allocation.items() if len(results[c]) >= n]
+            if shortfall <= 0 or not full:
+                break
+
+            retry = {}
+            for category_id, n in zip(full, _allocate(shortfall, len(full))):
+                if n > 0:
+                    allocation[category_id] += n
+                    retry[category_id] = allocation[category_id]
+            results.update(await self._fetch_allocation(retry, region_code, tags))
+
+        return _interleave(list(results.values()), max_results)
+
+    async def _fetch_allocation(self,
+                                allocation: dict[str, int],
+                                region_code: str,
+                                tags: list[str]) -> dict[str, list[PostRecord]]:
+        videos = await asyncio.gather(*(
+            self.get_trending_videos(
+                region_code=region_code,
+                max_results=n,
+                category_id=category_id,
+                tags=tags
+            )
+            for category_id, n in allocation.items()
+        ))
+        return dict(zip(allocation, videos))
+
+    @staticmethod
+    def _to_post(item: dict, tags: list[str]) -> PostRecord:
+        return PostRecord(
+            source="youtube",
+            uid=item['id'],
+            title=item['snippet']['title'],
+            content=item['snippet']['description'],
+            created_at=datetime.fromisoformat(item['snippet']['publishedAt']),
+            author=item['snippet']['channelTitle'],
+            url=f"https://www.youtube.com/watch?v={item['id']}",
+            tags=sorted(set(tags)),
+            metadata={
+                "view_count": int(item['statistics'].get('viewCount', 0)),
+                "like_count": int(item['statistics'].get('likeCount', 0)),
+                "thumbnail": item['snippet']['thumbnails']['high']['url'],
+                "relevance": YoutubeTrendingCrawler._calculate_relevance(item['statistics'])
+            },
+        )
         
     @staticmethod
     def _calculate_relevance(statistics: dict) -> float:
@@ -0,0 +1,130 @@
+import zlib
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from app.text import tokenize
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "igshid", "si", "feature", "ref", "ref_src", "share_id"})
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """
+    Reduce a URL to a form shared by its variants.
+
+    Scheme, ``www.``/``m.`` prefixes, trailing slashes, fragments and
+    tracking parameters are dropped and the query is sorted. YouTube links
+    (watch, youtu.be, shorts) collapse to the video id.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    if not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    for prefix in ("www.", "m.", "old."):
+        host = host.removeprefix(prefix)
+    path = parts.path.rstrip("/")
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+
+    if host == "youtu.be" and path:
+        return f"youtube:{path.lstrip('/')}"
+    if host == "youtube.com":
+        if path.startswith("/shorts/"):
+            return f"youtube:{path.removeprefix('/shorts/')}"
+        video_id = dict(query).get("v")
+        if path == "/watch" and video_id:
+            return f"youtube:{video_id}"
+
+    return f"{host}{path}?{urlencode(sorted(query))}" if query else f"{host}{path}"
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    """Character n-grams of the folded, space-joined tokens of text."""
+    joined = " ".join(tokenize(text))
+    if len(joined) <= size:
+        return {joined} if joined else set()
+    return {joined[i:i + size] for i in range(len(joined) - size + 1)}
+
+
+def numbers(text: str) -> frozenset[str]:
+    """Tokens carrying digits: episode, model and version numbers."""
+    return frozenset(token for token in tokenize(text) if any(c.isdigit() for c in token))
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """
+    MinHash signatures of ``num_perm`` slots using one-permutation hashing.
+
+    Each item is hashed once and lands in one slot, which keeps the lowest
+    value it sees; empty slots borrow from the next filled one
+    (densification). This costs O(items) per signature instead of
+    O(items * num_perm) for independent hash functions.
+    """
+
+    def __init__(self, num_perm: int, seed: int = 1):
+        self.num_perm = num_perm
+        self._seed = seed
+
+    def signature(self, items: set[str]) -> tuple[int, ...]:
+        k = self.num_perm
+        slots: list[Optional[int]] = [None] * k
+        for item in items:
+            h = zlib.crc32(item.encode("utf-8"), self._seed)
+            slot, value = h % k, h // k
+            if slots[slot] is None or value < slots[slot]:
+                slots[slot] = value
+
+        if all(value is None for value in slots):
+            return (0,) * k
+
+        signature = []
+        for i in range(k):
+            offset = 0
+            while slots[(i + offset) % k] is None:
+                offset += 1
+            # Tag borrowed values with the distance so they only match alike
+            signature.append(slots[(i + offset) % k] * k + offset)
+        return tuple(signature)
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive index over MinHash signatures.
+
+    Signatures are split into ``bands`` bands and items sharing any band
+    become candidates, so only likely matches are compared instead of all
+    pairs.
+    """
+
+    def __init__(self, bands: int, rows: int):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: list[defaultdict[tuple[int, ...], list[int]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+
+    def _bands(self, signature: tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def candidates(self, signature: tuple[int, ...]) -> set[int]:
+        found = set()
+        for band, key in self._bands(signature):
+            found.update(self._buckets[band].get(key, ()))
+        return found
+
+    def add(self, item: int, signature: tuple[int, ...]) -> None:
+        for band, key in self._bands(signature):
+            self._buckets[band][key].append(item)
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from loguru import logger
+
+
+Job = Callable[[], Awaitable[list[Any]]]
+
+
+@dataclass
+class SourceResult:
+    """Outcome of a single crawler job run by the FanOutExecutor"""
+    source: str
+    status: str  # "ok", "error", "timeout", "budget_exceeded"
+    data: list[Any] = field(default_factory=list)
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+
+    def summary(self) -> dict[str, Any]:
+        """Per-source block reported in the tool response metadata"""
+        block = {
+            "status": self.status,
+            "latency_ms": round(self.latency_ms, 1),
+            "count": len(self.data),
+        }
+        if self.error:
+            block["error"] = self.error
+        return block
+
+
+class FanOutExecutor:
+    """
+    Dispatch every crawler job at once and collect whatever finishes in time.
+
+    Each job gets its own deadline (``source_timeout`` or an override from
+    ``timeouts``) and the whole fan-out is bounded by ``budget`` seconds.
+    Jobs still running when the budget runs out are cancelled and reported
+    as ``budget_exceeded``.
+    """
+
+    def __init__(self,
+                 source_timeout: float,
+                 budget: float,
+                 timeouts: Optional[dict[str, float]] = None):
+        self.source_timeout = source_timeout
+        self.budget = budget
+        self.timeouts = timeouts or {}
+
+    def _timeout_for(self, source: str) -> float:
+        return min(self.timeouts.get(source, self.source_timeout), self.budget)
+
+    async def _run_job(self, source: str, job: Job) -> SourceResult:
+        start = time.perf_counter()
+        timeout = self._timeout_for(source)
+        task = asyncio.ensure_future(job())
+        try:
+            # Not wait_for: a TimeoutError raised by the job itself (e.g. an
+            # aiohttp timeout) is an upstream error, not our deadline expiring
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        if not done:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            data, status, error = [], "timeout", f"exceeded {timeout}s deadline"
+        else:
+            try:
+                data = task.result()
+                status, error = "ok", None
+            except Exception as e:
+                logger.error(f"Error fetching from {source}: {e}")
+                data, status, error = [], "error", str(e) or type(e).__name__
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"{source} finished with status={status} in {latency_ms:.0f}ms")
+        return SourceResult(source, status, data or [], latency_ms, error)
+
+    async def stream(self, jobs: dict[str, Job]) -> AsyncIterator[SourceResult]:
+        """Yield each source result as soon as its job completes"""
+        if not jobs:
+            return
+
+        start = time.perf_counter()
+        deadline = asyncio.get_running_loop().time() + self.budget
+        pending = {
+            asyncio.create_task(self._run_job(source, job)): source
+            for source, job in jobs.items()
+        }
+
+        try:
+            while pending:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    pending.keys(),
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    pending.pop(task)
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        for source in pending.values():
+            logger.warning(f"{source} cancelled after request budget of {self.budget}s")
+            yield SourceResult(source, "budget_exceeded", [], latency_ms,
+                               f"exceeded {self.budget}s request budget")
+
+    async def run(self, jobs: dict[str, Job]) -> list[SourceResult]:
+        """Run all jobs concurrently and return their results in completion order"""
+        return [result async for result in self.stream(jobs)]
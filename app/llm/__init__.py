@@ -1,4 +1,6 @@
 from .gemini import LangChainGoogleGenerative
 from .deepseek import LangchainDeepSeek
+from .cache import LLMResponseCache
+from .batch import BatchSummarizer
 
-__all__ = ["LangChainGoogleGenerative", "LangchainDeepSeek"]
\ No newline at end of file
+__all__ = ["LangChainGoogleGenerative", "LangchainDeepSeek", "LLMResponseCache", "BatchSummarizer"]
\ No newline at end of file
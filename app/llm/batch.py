@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+from loguru import logger
+
+from .deepseek import LangchainDeepSeek
+from .cache import normalize_text
+
+
+class BatchSummarizer:
+    """
+    Summarize several headline groups with a single completion.
+
+    All groups are packed into one numbered prompt and the model is asked
+    for a JSON array of ``{"id", "description"}`` objects. Groups missing
+    from the answer, or all of them if it cannot be parsed, fall back to
+    one completion each.
+
+    Descriptions are cached per group, under the key a single-group
+    completion would use, so a group seen in an earlier batch (or alone)
+    is not summarized again and only the misses are sent.
+    """
+
+    def __init__(self,
+                 llm: LangchainDeepSeek,
+                 instruction: str = "Generate a short Vietnamese description for the following content",
+                 system_prompt: str = "Only return answer. no explain"):
+        self.llm = llm
+        self.instruction = instruction
+        self.system_prompt = system_prompt
+
+    @staticmethod
+    def _normalize(headlines: list[str]) -> list[str]:
+        # Same headlines in any order or spacing should hit the summary cache
+        return sorted({normalize_text(title) for title in headlines if title})
+
+    def _single_messages(self, headlines: list[str]) -> list[dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": f"{self.instruction}: {headlines}"},
+        ]
+
+    def _batch_messages(self, groups: dict[int, list[str]]) -> list[dict[str, str]]:
+        items = "\n".join(f"{i}. {headlines}" for i, headlines in groups.items())
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {
+                "role": "user",
+                "content": (
+                    f"{self.instruction}, separately for each numbered item below.\n"
+                    f"{items}\n\n"
+                    'Return only a JSON array like [{"id": 0, "description": "..."}] '
+                    "with one object per item."
+                ),
+            },
+        ]
+
+    @staticmethod
+    def _parse(content: str, expected: set[int]) -> dict[int, str]:
+        start, end = content.find("["), content.rfind("]")
+        if start == -1 or end <= start:
+            return {}
+        try:
+            items = json.loads(content[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+
+        descriptions = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_id = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            description = item.get("description")
+            if item_id in expected and isinstance(description, str) and description.strip():
+                descriptions[item_id] = description.strip()
+        return descriptions
+
+    async def summarize(self, headlines: list[str]) -> str:
+        """Describe one headline group with its own completion."""
+        headlines = self._normalize(headlines)
+        if not headlines:
+            return ""
+        try:
+            return await self.llm.generate_response(self._single_messages(headlines))
+        except Exception as e:
+            logger.error(f"Error summarizing headlines: {e}")
+            return ""
+
+    async def summarize_many(self, groups: list[list[str]]) -> list[str]:
+        """Describe every headline group, in order, using one completion when possible."""
+        pending = {
+            i: headlines
+            for i, headlines in enumerate(self._normalize(g) for g in groups)
+            if headlines
+        }
+        results = [""] * len(groups)
+
+        cache = self.llm.cache
+        keys = {i: self.llm.cache_key(self._single_messages(h)) for i, h in pending.items()}
+        if cache is not None:
+            for i, key in keys.items():
+                description = await cache.get(key)
+                if description is not None:
+                    results[i] = description
+                    del pending[i]
+
+        if len(pending) > 1:
+            try:
+                # Only the per-group descriptions are worth caching
+                content = await self.llm.generate_response(
+                    self._batch_messages(pending),
+                    max_tokens=300 * len(pending),
+                    use_cache=False
+                )
+                for i, description in self._parse(content, set(pending)).items():
+                    results[i] = description
+                    del pending[i]
+                    if cache is not None:
+                        await cache.set(keys[i], description)
+            except Exception as e:
+                logger.warning(f"Batch summarization failed, falling back to single calls: {e}")
+
+            if pending:
+                logger.warning(f"Batch summary missing {len(pending)} items, summarizing them one by one")
+
+        if pending:
+            singles = await asyncio.gather(*(self.summarize(h) for h in pending.values()))
+            for i, description in zip(pending, singles):
+                results[i] = description
+
+        return results
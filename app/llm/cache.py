@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Optional
+
+from loguru import logger
+
+from app.cache import TTLCache
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace so equivalent prompts hash alike."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache for LLM completions.
+
+    Entries are keyed by a hash of the model, sampling parameters and the
+    normalized messages. They live in a bounded in-memory TTL cache and,
+    when ``path`` is set, in a SQLite file so they survive restarts.
+    """
+
+    NAMESPACE = "llm"
+
+    def __init__(self, ttl: float, max_entries: int, path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._memory = TTLCache(max_entries=max_entries, default_ttl=ttl)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(model: str, messages: list[dict[str, str]], **params: Any) -> str:
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": m.get("role"), "content": normalize_text(m.get("content", ""))}
+                for m in messages
+            ],
+            "params": params,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_created_at ON llm_cache(created_at)"
+            )
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _disk_set(self, key: str, value: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time())
+                )
+                # Drop expired rows and keep only the newest max_entries
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at <= ? OR key NOT IN ("
+                    " SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT ?)",
+                    (time.time() - self.ttl, self.max_entries)
+                )
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._memory.get((self.NAMESPACE, key))
+        if value is not None or not self.path:
+            return value
+
+        try:
+            value = await asyncio.to_thread(self._disk_get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+        if value is not None:
+            self._memory.set((self.NAMESPACE, key), value)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._memory.set((self.NAMESPACE, key), value)
+        if not self.path:
+            return
+
+        try:
+            await asyncio.to_thread(self._disk_set, key, value)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._memory.stats()["sources"].get(self.NAMESPACE, {"hits": 0, "misses": 0}),
+            "size": len(self._memory),
+            "persistent": bool(self.path),
+        }
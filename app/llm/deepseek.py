@@ -1,5 +1,7 @@
 from .base import BaseGenerative
+from .cache import LLMResponseCache
 from  openai import AsyncOpenAI
+from typing import Optional
 import json
 import httpx
 from loguru import logger
@@ -9,16 +11,36 @@ class LangchainDeepSeek(BaseGenerative):
                  api_key: str,
                  name: str = "deepseek/deepseek-r1:free",
                  base_url: str = "https://openrouter.ai/api/v1",
-                 temperature: float = 0.3 ):
+                 temperature: float = 0.3,
+                 cache: Optional[LLMResponseCache] = None):
         super().__init__(name)
 
         self.api_key = api_key
         self.base_url = base_url
         self.temperature = temperature
+        self.cache = cache
         self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)  # Initialize once
 
 
-    async def generate_response(self, messages: list[dict[str, str]], max_tokens: int = 1000) -> str:
+    def cache_key(self, messages: list[dict[str, str]], max_tokens: int = 1000) -> Optional[str]:
+        """Key the response cache stores this completion under, None without a cache."""
+        if self.cache is None:
+            return None
+        return self.cache.fingerprint(
+            self.name, messages, temperature=self.temperature, max_tokens=max_tokens
+        )
+
+    async def generate_response(self,
+                                messages: list[dict[str, str]],
+                                max_tokens: int = 1000,
+                                use_cache: bool = True) -> str:
+        cache_key = self.cache_key(messages, max_tokens) if use_cache else None
+        if cache_key is not None:
+            cached_content = await self.cache.get(cache_key)
+            if cached_content is not None:
+                return cached_content
+
+        content = None
         try:
             # headers = {
             #     "Authorization": f"Bearer {self.api_key}",
@@ -55,6 +77,9 @@ class LangchainDeepSeek(BaseGenerative):
             # Remove markdown code block if exists
             if content.startswith("```"):
                 content = content.strip("```").replace("json", "").strip()
+
+            if cache_key is not None and content:
+                await self.cache.set(cache_key, content)
             return content
             
         except Exception as e:
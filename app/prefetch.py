@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from loguru import logger
+
+from app.cache import CallRegistry, TTLCache, crawl_cache, crawl_calls, untracked
+from app.quota import QuotaAccountant, quota
+
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class PrefetchScheduler:
+    """
+    Periodically refresh the hottest crawler calls in the background.
+
+    Every ``interval`` seconds the ``top_n`` most requested upstream calls in
+    the call registry are considered. Those whose cache entry would expire
+    before the next tick are re-issued, bypassing the cache so the entry is
+    renewed in time; calls to a source whose quota runs low are left alone.
+    ``seeds`` are fetched once, on the first tick, through the normal cached
+    path to warm the cache at start-up. They are not recorded as traffic,
+    so only charts that clients actually request keep being refreshed.
+    """
+
+    def __init__(self,
+                 interval: float,
+                 top_n: int,
+                 seeds: Optional[list[Job]] = None,
+                 concurrency: int = 4,
+                 decay: float = 0.5,
+                 registry: CallRegistry = crawl_calls,
+                 cache: TTLCache = crawl_cache,
+                 quota: QuotaAccountant = quota):
+        self.interval = interval
+        self.top_n = top_n
+        self.seeds = seeds or []
+        self.decay = decay
+        self.registry = registry
+        self.cache = cache
+        self.quota = quota
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._task: Optional[asyncio.Task] = None
+        self._warmed_up = False
+
+    async def _run(self, name: str, job: Job) -> None:
+        async with self._semaphore:
+            try:
+                if name == "seed":
+                    with untracked():
+                        await job()
+                else:
+                    await job()
+            except Exception as e:
+                logger.warning(f"Prefetch of {name} failed: {e}")
+
+    def _needs_refresh(self, key: Any) -> bool:
+        source = key[0] if isinstance(key, tuple) and key else None
+        if self.quota.is_low(source):
+            return False
+        expires_in = self.cache.expires_in(key)
+        return expires_in is None or expires_in <= self.interval
+
+    async def refresh_once(self) -> int:
+        """Refresh the hottest calls due to expire (plus the seeds on the first tick) and return how many ran."""
+        hottest = self.registry.hottest(self.top_n)
+        jobs = [(str(key), refresh) for key, refresh in hottest if self._needs_refresh(key)]
+        if not self._warmed_up:
+            jobs += [("seed", seed) for seed in self.seeds[:self.top_n - len(hottest)]]
+            self._warmed_up = True
+
+        await asyncio.gather(*(self._run(name, job) for name, job in jobs))
+        self.registry.decay(self.decay)
+
+        logger.info(f"Prefetched {len(jobs)} trend charts")
+        return len(jobs)
+
+    async def _loop(self) -> None:
+        while True:
+            await self.refresh_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from loguru import logger
+
+from app.settings import settings
+
+
+# Units charged per call type; anything not listed costs 1
+QUOTA_COSTS: dict[str, dict[str, int]] = {
+    # https://developers.google.com/youtube/v3/determine_quota_cost
+    "youtube": {"/videos": 1, "/search": 100},
+    # One SerpAPI search credit per engine request
+    "serp": {"google_trends_trending_now": 1, "google_trends_news": 1},
+}
+
+
+class QuotaExceededError(Exception):
+    """Raised before a call that would exceed a source's daily budget."""
+
+
+class QuotaAccountant:
+    """
+    Track spent upstream quota per source against a daily budget.
+
+    Budgets reset at midnight UTC. ``is_low()`` turns true once less than
+    ``reserve_ratio`` of a budget is left, which callers use to degrade
+    (serve stale cache, skip enrichment) before the budget runs out.
+    """
+
+    def __init__(self,
+                 budgets: dict[str, int],
+                 costs: dict[str, dict[str, int]] = QUOTA_COSTS,
+                 reserve_ratio: float = 0.1):
+        self.budgets = budgets
+        self.costs = costs
+        self.reserve_ratio = reserve_ratio
+        self._spent: dict[str, int] = {}
+        self._day = self._today()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    def _roll_over(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._spent.clear()
+
+    def cost(self, source: str, call: str) -> int:
+        return self.costs.get(source, {}).get(call, 1)
+
+    def remaining(self, source: str) -> Optional[int]:
+        budget = self.budgets.get(source)
+        if budget is None:
+            return None
+        self._roll_over()
+        return budget - self._spent.get(source, 0)
+
+    def is_low(self, source: Optional[str]) -> bool:
+        remaining = self.remaining(source) if source else None
+        if remaining is None:
+            return False
+        return remaining <= self.budgets[source] * self.reserve_ratio
+
+    def charge(self, source: Optional[str], call: str) -> None:
+        """Record a call, refusing it if the daily budget cannot cover it."""
+        if not source:
+            return
+        cost = self.cost(source, call)
+        remaining = self.remaining(source)
+        if remaining is not None and cost > remaining:
+            logger.warning(f"{source} quota exhausted ({remaining} left, {call} costs {cost})")
+            raise QuotaExceededError(f"{source} daily quota exhausted")
+        self._spent[source] = self._spent.get(source, 0) + cost
+
+    def stats(self) -> dict[str, Any]:
+        self._roll_over()
+        return {
+            source: {
+                "spent": self._spent.get(source, 0),
+                "budget": budget,
+                "low": self.is_low(source),
+            }
+            for source, budget in self.budgets.items()
+        }
+
+
+quota = QuotaAccountant(
+    budgets=settings.QUOTA_DAILY_BUDGETS,
+    reserve_ratio=settings.QUOTA_RESERVE_RATIO
+)
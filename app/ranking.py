@@ -0,0 +1,130 @@
+import heapq
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+from app.schemas.records import PostRecord
+from app.settings import settings
+from app.tools.tag_parser import TAG_INDEX
+
+# Post source -> crawler name used in TAG_MAPPINGS
+SOURCE_CRAWLERS = {
+    "youtube": "youtube",
+    "serp": "google_trends",
+    "reddit": "reddit",
+    "hf": "huggingface",
+}
+
+MAX_PRIORITY = max(
+    (priority for route in TAG_INDEX.values() for _, priority in route.targets.values()),
+    default=1
+)
+
+
+def _engagement(post: PostRecord) -> float:
+    """Raw engagement on a log scale, NaN when the source reports none."""
+    metadata = post.metadata or {}
+    if post.source == "youtube":
+        views = metadata.get("view_count") or 0
+        return math.log1p(views) * (1.0 + (metadata.get("relevance") or 0.0))
+    if post.source == "reddit":
+        score = max(metadata.get("score") or 0, 0)
+        return math.log1p(score) * (metadata.get("upvote_ratio") or 1.0)
+    if post.source == "hf":
+        return math.log1p(metadata.get("upvotes") or 0)
+    return math.nan
+
+
+class Ranker:
+    """
+    Cross-source scoring of crawled posts.
+
+    A post's score is a weighted sum of:
+      - engagement (views/likes, upvotes, score) on a log scale, min-max
+        normalized within its source, since counts are not comparable
+        across platforms; sources without counts use their listing order
+      - recency, halving every ``half_life_hours`` since ``created_at``;
+        posts without a timestamp get the batch median instead of looking new
+      - tag weight, the best ``TAG_MAPPINGS`` priority of the requested
+        tags for the post's crawler, preferring tags the post carries
+    Scores are computed for the whole batch with NumPy.
+    """
+
+    def __init__(self,
+                 weights: dict[str, float],
+                 half_life_hours: float):
+        self.weights = weights
+        self.half_life_hours = half_life_hours
+
+    def _tag_weight(self, post: PostRecord, tags: list[str]) -> float:
+        crawler = SOURCE_CRAWLERS.get(post.source)
+        best = fallback = 0
+        for tag in tags:
+            route = TAG_INDEX.get(tag)
+            if route is None or crawler not in route.targets:
+                continue
+            priority = route.targets[crawler][1]
+            fallback = max(fallback, priority)
+            if tag in post.tags:
+                best = max(best, priority)
+        # Posts fetched for a tag but not labelled with it count half
+        return (best or fallback / 2) / MAX_PRIORITY
+
+    def score(self, posts: list[PostRecord], tags: list[str], now: Optional[float] = None) -> np.ndarray:
+        if not posts:
+            return np.zeros(0)
+
+        now = time.time() if now is None else now
+        sources = [post.source for post in posts]
+        source_ids = {source: i for i, source in enumerate(dict.fromkeys(sources))}
+        codes = np.fromiter((source_ids[s] for s in sources), dtype=np.intp, count=len(posts))
+
+        raw = np.fromiter((_engagement(post) for post in posts), dtype=float, count=len(posts))
+        # Naive datetimes (Reddit, SERP) are local time, which timestamp() assumes
+        created = np.fromiter(
+            (post.created_at.timestamp() if post.created_at else math.nan for post in posts),
+            dtype=float, count=len(posts)
+        )
+        tag_weight = np.fromiter((self._tag_weight(post, tags) for post in posts), dtype=float, count=len(posts))
+
+        # Sources without counts are ranked by their order in the listing
+        missing = np.isnan(raw)
+        if missing.any():
+            position = np.arange(len(posts), dtype=float)
+            raw[missing] = -position[missing]
+
+        # Per-source min-max normalization
+        n_sources = len(source_ids)
+        low = np.full(n_sources, np.inf)
+        high = np.full(n_sources, -np.inf)
+        np.minimum.at(low, codes, raw)
+        np.maximum.at(high, codes, raw)
+        span = (high - low)[codes]
+        engagement = np.divide(raw - low[codes], span, out=np.full(len(posts), 0.5), where=span > 0)
+
+        age_hours = np.clip(now - created, 0, None) / 3600.0
+        recency = np.exp2(-age_hours / self.half_life_hours)
+        undated = np.isnan(recency)
+        if undated.any():
+            recency[undated] = np.median(recency[~undated]) if not undated.all() else 0.5
+
+        return (
+            self.weights.get("engagement", 0.0) * engagement
+            + self.weights.get("recency", 0.0) * recency
+            + self.weights.get("tags", 0.0) * tag_weight
+        )
+
+    @staticmethod
+    def top_k(posts: list[PostRecord], scores: np.ndarray, k: Optional[int]) -> list[tuple[float, PostRecord]]:
+        """Best k posts by score, highest first (all of them when k is falsy)."""
+        k = k or len(posts)
+        best = heapq.nlargest(k, zip(scores.tolist(), range(0, -len(posts), -1)))
+        return [(score, posts[-i]) for score, i in best]
+
+
+ranker = Ranker(
+    weights=settings.RANK_WEIGHTS,
+    half_life_hours=settings.RANK_HALF_LIFE_HOURS
+)
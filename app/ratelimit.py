@@ -0,0 +1,74 @@
+import asyncio
+import time
+from typing import Optional
+
+from app.settings import settings
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for coroutines.
+
+    Allows ``rate`` acquisitions per second on average with bursts of up to
+    ``burst``. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+
+class RateLimiterRegistry:
+    """
+    One token bucket per upstream host.
+
+    Hosts without a configured rate use ``default_rate``; when that is
+    ``None`` they are not throttled.
+    """
+
+    def __init__(self, rates: dict[str, float], default_rate: Optional[float] = None):
+        self.rates = rates
+        self.default_rate = default_rate
+        self._limiters: dict[str, Optional[AsyncRateLimiter]] = {}
+
+    def for_host(self, host: str) -> Optional[AsyncRateLimiter]:
+        if host not in self._limiters:
+            rate = self.rates.get(host, self.default_rate)
+            self._limiters[host] = (
+                AsyncRateLimiter(rate=rate, burst=max(int(rate), 1)) if rate else None
+            )
+        return self._limiters[host]
+
+    async def acquire(self, host: str) -> None:
+        limiter = self.for_host(host)
+        if limiter is not None:
+            await limiter.acquire()
+
+
+host_limiters = RateLimiterRegistry(
+    rates=settings.HOST_RATE_LIMITS,
+    default_rate=settings.DEFAULT_HOST_RATE_LIMIT
+)
@@ -0,0 +1,112 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+from loguru import logger
+
+from app.settings import settings
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream host.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast for ``recovery_timeout`` seconds. Then a single trial call is
+    let through (half-open): success closes the circuit, failure reopens it.
+    A trial that never finishes (cancelled, refused by the quota) also
+    reopens it, otherwise the circuit would stay half-open for good.
+    """
+
+    def __init__(self, host: str, failure_threshold: int, recovery_timeout: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.state = "closed"
+        self._opened_at = 0.0
+
+    def before_call(self) -> None:
+        if self.state == "closed":
+            return
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self.state = "half_open"
+            logger.info(f"Circuit for {self.host} half-open, sending a trial request")
+            return
+        raise CircuitOpenError(f"circuit open for {self.host}")
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info(f"Circuit for {self.host} closed")
+        self.failures = 0
+        self.state = "closed"
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit for {self.host} opened after {self.failures} failures")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+
+    def record_abandoned(self) -> None:
+        """The call was given up before the upstream answered."""
+        if self.state == "half_open":
+            logger.info(f"Trial request to {self.host} abandoned, circuit reopened")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per upstream host."""
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def for_host(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.recovery_timeout)
+        return self._breakers[host]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            host: {"state": breaker.state, "failures": breaker.failures}
+            for host, breaker in self._breakers.items()
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+circuit_breakers = CircuitBreakerRegistry(
+    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+    recovery_timeout=settings.CIRCUIT_RECOVERY_TIMEOUT
+)
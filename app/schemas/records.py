@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class PostRecord:
+    """
+    Lean post used inside the crawl pipeline.
+
+    Crawlers build these, with source-specific fields (view counts, upvotes,
+    thumbnails, ...) kept in a plain ``metadata`` dict. ``to_dict`` produces
+    the public post JSON shape, so conversion only happens when a response
+    is sent; it is the single definition of that layout.
+    """
+
+    source: str
+    uid: str
+    title: str
+    author: str
+    content: Optional[str] = None
+    url: Optional[str] = None
+    tags: list[str] = field(default_factory=list)
+    # None when the source does not say when the post was published
+    created_at: Optional[datetime] = None
+    metadata: Optional[dict[str, Any]] = None
+    # Sources of near-duplicates collapsed into this post
+    merged_sources: list[str] = field(default_factory=list)
+    # Ranking score, set when the response is assembled
+    score: Optional[float] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready dict in the public post layout returned by the tools."""
+        return {
+            "source": self.source,
+            "uid": self.uid,
+            "title": self.title,
+            "content": self.content,
+            "author": self.author,
+            "url": self.url,
+            "tags": self.tags,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "metadata_": self.metadata,
+            "merged_sources": self.merged_sources,
+            "score": self.score,
+        }
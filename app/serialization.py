@@ -0,0 +1,48 @@
+import json
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from typing import Any
+
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types the JSON backends do not know."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Encode obj as JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=_default, ensure_ascii=False)
+
+
+def tool_result(payload: dict[str, Any]) -> ToolResult:
+    """
+    Wrap a JSON-ready payload as a tool result.
+
+    The text content is encoded once with ``dumps`` and the same dict is
+    used as structured content, instead of FastMCP serializing a pydantic
+    response through its generic paths.
+    """
+    return ToolResult(
+        content=[TextContent(type="text", text=dumps(payload))],
+        structured_content=payload
+    )
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 import os
 
 class CommonConfig(BaseSettings):
@@ -14,5 +15,101 @@ class Settings(CommonConfig):
     SERP_TOKEN: str
     LLM_TOKEN: setattr
 
+    # Fan-out deadlines (seconds)
+    SOURCE_TIMEOUT: float = 15.0
+    SOURCE_TIMEOUTS: dict[str, float] = {"google_trends": 25.0}
+    REQUEST_BUDGET: float = 30.0
+
+    # Pooled HTTP connections shared by each crawler's session
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 20
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_DNS_CACHE_TTL: int = 300
+
+    # Stored upstream responses revalidated with ETag/Last-Modified
+    HTTP_CACHE_MAX_ENTRIES: int = 1024
+    HTTP_CACHE_TTL: float = 24 * 60 * 60.0
+
+    # Requests per second per upstream host (token bucket, burst = rate)
+    HOST_RATE_LIMITS: dict[str, float] = {
+        "www.googleapis.com": 10.0,
+        "serpapi.com": 5.0,
+        "huggingface-paper-explorer.vercel.app": 5.0,
+        "huggingface.co": 10.0,
+    }
+    DEFAULT_HOST_RATE_LIMIT: Optional[float] = None
+
+    # Retries for idempotent requests (exponential backoff with full jitter)
+    HTTP_MAX_RETRIES: int = 2
+    HTTP_BACKOFF_BASE: float = 0.5
+    HTTP_BACKOFF_MAX: float = 8.0
+
+    # Per-host circuit breaker: open after N consecutive failures
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT: float = 30.0
+
+    # Daily upstream quota (YouTube units, SerpAPI credits)
+    QUOTA_DAILY_BUDGETS: dict[str, int] = {"youtube": 10000, "serp": 1000}
+    QUOTA_RESERVE_RATIO: float = 0.1
+
+    # Crawler result cache, TTLs in seconds keyed by post source
+    CACHE_MAX_ENTRIES: int = 512
+    CACHE_DEFAULT_TTL: float = 300.0
+    CACHE_TTLS: dict[str, float] = {
+        "youtube": 600.0,
+        "serp": 900.0,
+        "hf": 1800.0,
+        "reddit": 300.0,
+    }
+
+    # Near-duplicate collapsing: title Jaccard over character 3-grams,
+    # candidates found with MinHash + LSH (bands * rows = permutations)
+    DEDUP_TITLE_THRESHOLD: float = 0.6
+    DEDUP_MIN_SHINGLES: int = 8
+    DEDUP_MINHASH_PERMUTATIONS: int = 32
+    DEDUP_LSH_BANDS: int = 16
+
+    # Cross-source ranking, see app.ranking; RANK_TOP_K = 0 keeps every post
+    RANK_WEIGHTS: dict[str, float] = {"engagement": 0.5, "recency": 0.3, "tags": 0.2}
+    RANK_HALF_LIFE_HOURS: float = 24.0
+    RANK_TOP_K: int = 20
+
+    # SERP trend enrichment (news lookup + LLM summary per trend)
+    SERP_TRENDS_LIMIT: int = 5
+    SERP_ENRICH_CONCURRENCY: int = 5
+
+    # HuggingFace daily papers; upper cap on max_results_per_crawler
+    HF_PAPERS_LIMIT: int = 25
+    HF_SCRAPE_CONCURRENCY: int = 10
+
+    # HTML parsing: "auto", "selectolax", "lxml" or "html.parser"
+    HTML_PARSER: str = "auto"
+    HTML_PARSE_WORKERS: int = 4
+
+    # Background refresh of the hottest trend charts
+    PREFETCH_ENABLED: bool = False
+    PREFETCH_INTERVAL: float = 240.0
+    PREFETCH_TOP_N: int = 20
+    PREFETCH_CONCURRENCY: int = 4
+
+    # Local history of crawled posts (SQLite)
+    TREND_STORE_ENABLED: bool = True
+    TREND_STORE_PATH: str = "trends.sqlite3"
+    TREND_STORE_RETENTION: float = 30 * 24 * 60 * 60.0
+
+    # Free-text interest -> tag resolution; set TAG_EMBEDDINGS_PATH (.npz)
+    # to cache the fallback embeddings on disk
+    TAG_RESOLVER_MIN_SIMILARITY: float = 0.6
+    TAG_EMBEDDINGS_PATH: Optional[str] = None
+
+    # LLM summary cache; set LLM_CACHE_PATH to persist it in SQLite
+    LLM_CACHE_TTL: float = 6 * 60 * 60.0
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_PATH: Optional[str] = None
+
+    # Expose the process-wide cache/quota/circuit diagnostics as the
+    # get_stats tool; tool responses only carry per-request metadata
+    STATS_TOOL_ENABLED: bool = False
+
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Hashable
+
+from loguru import logger
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one in-flight coroutine.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is still running await the same task instead of issuing their
+    own upstream request. The task is shielded, so a caller hitting its own
+    deadline does not cancel the fetch for everyone else.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._counters: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"executions": 0, "merged": 0}
+        )
+
+    @staticmethod
+    def _namespace(key: Hashable) -> str:
+        return str(key[0]) if isinstance(key, tuple) and key else "default"
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        counters = self._counters[self._namespace(key)]
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            counters["executions"] += 1
+        else:
+            counters["merged"] += 1
+            logger.debug(f"Joined in-flight request for {key}")
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "sources": {ns: dict(c) for ns, c in self._counters.items()},
+        }
@@ -0,0 +1,329 @@
+import asyncio
+import base64
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from loguru import logger
+
+from app.schemas.records import PostRecord
+from app.serialization import dumps
+from app.settings import settings
+from app.text import STOPWORDS, fold_text, tokenize
+
+
+SCHEMA = (
+    # Explicit id so full-text rows keep pointing at the right post
+    "CREATE TABLE IF NOT EXISTS posts ("
+    " id INTEGER PRIMARY KEY,"
+    " source TEXT NOT NULL,"
+    " uid TEXT NOT NULL,"
+    " title TEXT NOT NULL,"
+    " content TEXT,"
+    " author TEXT,"
+    " url TEXT,"
+    " created_at REAL NOT NULL,"
+    " first_seen REAL NOT NULL,"
+    " last_seen REAL NOT NULL,"
+    " metadata TEXT,"
+    " UNIQUE (source, uid))",
+    "CREATE TABLE IF NOT EXISTS post_tags ("
+    " tag TEXT NOT NULL,"
+    " source TEXT NOT NULL,"
+    " uid TEXT NOT NULL,"
+    " PRIMARY KEY (tag, source, uid),"
+    " FOREIGN KEY (source, uid) REFERENCES posts(source, uid) ON DELETE CASCADE)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_last_seen ON posts(last_seen)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_source_created_at ON posts(source, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_post_tags_post ON post_tags(source, uid)",
+    # Full-text index over diacritic-folded titles and content, kept in
+    # sync with posts by triggers (fold() is registered on the connection)
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(title, content, tokenize = 'unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN"
+    " INSERT INTO posts_fts (rowid, title, content)"
+    " VALUES (new.id, fold(new.title), fold(COALESCE(new.content, '')));"
+    " END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, content ON posts"
+    " WHEN old.title IS NOT new.title OR old.content IS NOT new.content BEGIN"
+    " DELETE FROM posts_fts WHERE rowid = old.id;"
+    " INSERT INTO posts_fts (rowid, title, content)"
+    " VALUES (new.id, fold(new.title), fold(COALESCE(new.content, '')));"
+    " END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN"
+    " DELETE FROM posts_fts WHERE rowid = old.id;"
+    " END",
+)
+
+UPSERT_POST = (
+    "INSERT INTO posts"
+    " (source, uid, title, content, author, url, created_at, first_seen, last_seen, metadata)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT (source, uid) DO UPDATE SET"
+    " title = excluded.title,"
+    " content = COALESCE(excluded.content, posts.content),"
+    " author = excluded.author,"
+    " url = excluded.url,"
+    " last_seen = excluded.last_seen,"
+    " metadata = excluded.metadata"
+)
+
+
+TAG_SEPARATOR = "\x1f"
+
+POST_COLUMNS = (
+    "SELECT p.source, p.uid, p.title, p.content, p.author, p.url, p.created_at,"
+    " p.metadata,"
+    " (SELECT group_concat(t.tag, char(31)) FROM post_tags t"
+    "  WHERE t.source = p.source AND t.uid = p.uid) AS tags"
+)
+SELECT_POSTS = POST_COLUMNS + " FROM posts p"
+SEARCH_POSTS = (
+    POST_COLUMNS + ", bm25(posts_fts, 2.0, 1.0) AS rank"
+    " FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid"
+    " WHERE posts_fts MATCH ?"
+)
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 query matching any folded, non-stopword term of a free-text query."""
+    terms = tokenize(query)
+    terms = [term for term in terms if term not in STOPWORDS] or terms
+    if not terms:
+        return None
+    # Longer terms also match as prefixes ("transformer" -> "transformers")
+    return " OR ".join(
+        f'"{term}"*' if len(term) >= 4 else f'"{term}"'
+        for term in dict.fromkeys(terms)
+    )
+
+
+def encode_cursor(created_at: float, source: str, uid: str) -> str:
+    raw = json.dumps([created_at, source, uid], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[float, str, str]:
+    try:
+        created_at, source, uid = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(created_at), str(source), str(uid)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+
+class TrendStore:
+    """
+    Local SQLite (WAL) history of crawled posts.
+
+    Posts are upserted by (source, uid): ``first_seen`` is kept, while
+    ``last_seen`` and metadata follow the latest crawl, and tags
+    accumulate in ``post_tags``. Posts not seen for ``retention`` seconds
+    are pruned. An FTS5 index over titles and content follows every insert,
+    update and prune through triggers.
+    """
+
+    def __init__(self, path: str, retention: float):
+        self.path = path
+        self.retention = retention
+        self.ingested = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.create_function("fold", 1, fold_text, deterministic=True)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            with self._conn:
+                for statement in SCHEMA:
+                    self._conn.execute(statement)
+        return self._conn
+
+    @staticmethod
+    def _row(post: PostRecord, now: float) -> tuple:
+        return (
+            post.source,
+            post.uid,
+            post.title,
+            post.content,
+            post.author,
+            post.url,
+            # Undated posts are ordered by when they were first crawled
+            post.created_at.timestamp() if post.created_at else now,
+            now,
+            now,
+            dumps(post.metadata) if post.metadata is not None else None,
+        )
+
+    def _ingest(self, posts: list[PostRecord]) -> int:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(UPSERT_POST, (self._row(post, now) for post in posts))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO post_tags (tag, source, uid) VALUES (?, ?, ?)",
+                    ((tag, post.source, post.uid) for post in posts for tag in post.tags)
+                )
+                if now - self._last_prune > 60 * 60:
+                    conn.execute("DELETE FROM posts WHERE last_seen < ?", (now - self.retention,))
+                    self._last_prune = now
+        return len(posts)
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> PostRecord:
+        return PostRecord(
+            source=row["source"],
+            uid=row["uid"],
+            title=row["title"],
+            author=row["author"] or "",
+            content=row["content"],
+            url=row["url"],
+            tags=sorted(row["tags"].split(TAG_SEPARATOR)) if row["tags"] else [],
+            created_at=datetime.fromtimestamp(row["created_at"]),
+            metadata=json.loads(row["metadata"]) if row["metadata"] else None,
+        )
+
+    def _query(self,
+               tags: Optional[list[str]],
+               sources: Optional[list[str]],
+               since: Optional[float],
+               text: Optional[str],
+               limit: int,
+               cursor: Optional[str]) -> tuple[list[PostRecord], Optional[str]]:
+        clauses, params = [], []
+        if tags:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM post_tags t WHERE t.source = p.source AND t.uid = p.uid"
+                f" AND t.tag IN ({','.join('?' * len(tags))}))"
+            )
+            params.extend(tags)
+        if sources:
+            clauses.append(f"p.source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        if since is not None:
+            clauses.append("p.last_seen >= ?")
+            params.append(since)
+        if text:
+            # SQLite only folds ASCII case in LIKE, so compare folded text
+            clauses.append(
+                "(fold(p.title) LIKE ? ESCAPE '\\' OR fold(COALESCE(p.content, '')) LIKE ? ESCAPE '\\')"
+            )
+            folded = fold_text(text)
+            pattern = "%" + folded.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            params.extend([pattern, pattern])
+        if cursor:
+            # Keyset pagination: continue strictly after the last row returned
+            created_at, source, uid = decode_cursor(cursor)
+            clauses.append("(p.created_at < ? OR (p.created_at = ? AND (p.source, p.uid) > (?, ?)))")
+            params.extend([created_at, created_at, source, uid])
+
+        sql = SELECT_POSTS
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.created_at DESC, p.source, p.uid LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last["created_at"], last["source"], last["uid"])
+        return [self._to_record(row) for row in page], next_cursor
+
+    async def query(self,
+                    tags: Optional[list[str]] = None,
+                    sources: Optional[list[str]] = None,
+                    hours: Optional[float] = None,
+                    text: Optional[str] = None,
+                    limit: int = 20,
+                    cursor: Optional[str] = None) -> tuple[list[PostRecord], Optional[str]]:
+        """
+        Stored posts matching every given filter, newest first.
+
+        Args:
+            tags: Posts carrying any of these tags
+            sources: Posts from any of these sources ("youtube", "reddit", ...)
+            hours: Posts seen by a crawl within the last ``hours`` (None for all)
+            text: Substring of the title or content, ignoring case and diacritics
+            limit: Page size
+            cursor: ``next_cursor`` of the previous page
+
+        Returns:
+            The page of posts and the cursor of the next page, or None on the last one
+        """
+        since = time.time() - hours * 3600 if hours is not None else None
+        return await asyncio.to_thread(self._query, tags, sources, since, text, limit, cursor)
+
+    def _search(self,
+                match: str,
+                sources: Optional[list[str]],
+                since: Optional[float],
+                limit: int) -> list[tuple[PostRecord, float]]:
+        sql, params = SEARCH_POSTS, [match]
+        if sources:
+            sql += f" AND p.source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        if since is not None:
+            sql += " AND p.last_seen >= ?"
+            params.append(since)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        # bm25() is lower for better matches, flip it so higher is better
+        return [(self._to_record(row), -row["rank"]) for row in rows]
+
+    async def search(self,
+                     query: str,
+                     sources: Optional[list[str]] = None,
+                     hours: Optional[float] = None,
+                     limit: int = 10) -> list[tuple[PostRecord, float]]:
+        """
+        Full-text search over stored titles and content, best BM25 match first.
+
+        The query and the index are diacritic-folded, so "bao yagi" finds
+        "Bão Yagi". Posts match on any term, with titles weighted double.
+
+        Returns:
+            (post, relevance) pairs, higher relevance first
+        """
+        match = match_expression(query)
+        if match is None:
+            return []
+        since = time.time() - hours * 3600 if hours is not None else None
+        return await asyncio.to_thread(self._search, match, sources, since, limit)
+
+    async def ingest(self, posts: list[PostRecord]) -> None:
+        if not posts:
+            return
+        try:
+            self.ingested += await asyncio.to_thread(self._ingest, posts)
+        except sqlite3.Error as e:
+            logger.warning(f"Trend store ingestion failed: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict[str, Any]:
+        return {"path": self.path, "ingested": self.ingested}
+
+
+trend_store = (
+    TrendStore(path=settings.TREND_STORE_PATH, retention=settings.TREND_STORE_RETENTION)
+    if settings.TREND_STORE_ENABLED else None
+)
@@ -0,0 +1,26 @@
+import re
+import unicodedata
+
+# "đ" is a distinct letter, not "d" plus a combining mark, so NFKD keeps it
+_EXTRA_FOLDS = str.maketrans({"đ": "d", "Đ": "D"})
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+# Folded words too common to tell texts apart (English and Vietnamese)
+STOPWORDS = frozenset({
+    "a", "an", "the", "of", "on", "in", "to", "for", "and", "or", "is", "are",
+    "about", "what", "with", "from",
+    "ve", "cua", "va", "la", "cac", "nhung", "mot", "voi", "cho", "trong",
+})
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip diacritics, e.g. "Bão Yagi đổ bộ" -> "bao yagi do bo"."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.translate(_EXTRA_FOLDS))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> list[str]:
+    """Diacritic-folded word tokens."""
+    return [token for token in _NON_WORD.split(fold_text(text)) if token]
@@ -1,18 +1,129 @@
-from typing import List, Dict, Any, Set
-from collections import defaultdict
+from typing import List, Dict, Any, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from app.const.tags import TAG_MAPPINGS, PREDEFINED_TAGS
 
+
+# Bit position of each crawler in a tag's crawler mask
+CRAWLERS: Tuple[str, ...] = ("youtube", "google_trends", "reddit", "huggingface")
+CRAWLER_BITS = MappingProxyType({crawler: 1 << i for i, crawler in enumerate(CRAWLERS)})
+
+
+@dataclass(frozen=True)
+class TagRoute:
+    """Precompiled routing for one tag"""
+    crawler_mask: int
+    # crawler -> (category_id or None, priority)
+    targets: MappingProxyType
+
+
+def _compile_index() -> MappingProxyType:
+    index = {}
+    for tag, mappings in TAG_MAPPINGS.items():
+        mask = 0
+        targets = {}
+        for mapping in mappings:
+            mask |= CRAWLER_BITS[mapping.crawler]
+            targets[mapping.crawler] = (mapping.category_id, mapping.priority)
+        index[tag] = TagRoute(mask, MappingProxyType(targets))
+    return MappingProxyType(index)
+
+
+# Compiled once at import: O(1) tag validation and routing lookups
+VALID_TAGS = frozenset(PREDEFINED_TAGS)
+TAG_INDEX = _compile_index()
+
+
+@lru_cache(maxsize=1024)
+def _compile_configs(tags: Tuple[str, ...]) -> Tuple[Dict[str, Any], ...]:
+    """Build crawler configs for a canonical (sorted, unique, valid) tag tuple"""
+    if not tags:
+        # Default to reddit if no valid tags
+        return ({"crawler": "reddit", "assigned_tags": ()},)
+
+    mask = 0
+    for tag in tags:
+        route = TAG_INDEX.get(tag)
+        if route is not None:
+            mask |= route.crawler_mask
+
+    crawler_data = []
+    for crawler in CRAWLERS:
+        if not mask & CRAWLER_BITS[crawler]:
+            continue
+
+        assigned = []
+        categories = {}
+        max_priority = 0
+        for tag in tags:
+            route = TAG_INDEX.get(tag)
+            if route is None or crawler not in route.targets:
+                continue
+            category_id, priority = route.targets[crawler]
+            assigned.append(tag)
+            if category_id and priority > categories.get(category_id, 0):
+                categories[category_id] = priority
+            max_priority = max(max_priority, priority)
+
+        crawler_data.append((crawler, tuple(assigned), categories, max_priority))
+
+    # Sort by priority (higher priority first)
+    crawler_data.sort(key=lambda item: item[3], reverse=True)
+
+    configs = []
+    for crawler, assigned, categories, _ in crawler_data:
+        config = {
+            "crawler": crawler,
+            "assigned_tags": assigned
+        }
+
+        # Add params based on crawler type
+        if crawler == "youtube":
+            if categories:
+                # YouTube can handle multiple category IDs
+                config["params"] = {"category_ids": tuple(sorted(categories))}
+        elif crawler == "google_trends":
+            if categories:
+                # Google Trends uses a single category, the highest priority one
+                config["params"] = {
+                    "category_id": max(sorted(categories), key=categories.get)
+                }
+        elif crawler == "huggingface":
+            # HuggingFace uses search query
+            config["params"] = {"search_query": " ".join(assigned)}
+        # Reddit doesn't need category params
+
+        configs.append(config)
+
+    return tuple(configs)
+
+
+def _materialize(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Fresh mutable copy of a memoized config"""
+    result = {
+        "crawler": config["crawler"],
+        "assigned_tags": list(config["assigned_tags"])
+    }
+    if "params" in config:
+        result["params"] = {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in config["params"].items()
+        }
+    return result
+
+
 class TagParser:
     """
     Parse predefined tags from LLM and generate crawler configurations.
-    
+
     Example input: ["politician", "movies", "climate", "discussion"]
-    
+
     Example output:
     [
         {
             "crawler": "youtube",
-            "params": {"category_ids": ["30", "25"]},
+            "params": {"category_ids": ["25", "30"]},
             "assigned_tags": ["movies", "politician"]
         },
         {
@@ -25,112 +136,43 @@ class TagParser:
             "assigned_tags": ["discussion"]
         }
     ]
+
+    Routing uses the index compiled at import and configs are memoized per
+    canonical (sorted, de-duplicated) tag set, so repeated calls only copy
+    the cached result.
     """
-    
+
     def __init__(self, tags: List[str]):
         self.tags = tags
         self.validated_tags = self._validate_tags()
-    
+
     def _validate_tags(self) -> List[str]:
         """Validate that tags are from the predefined list"""
         valid_tags = []
         invalid_tags = []
-        
+
         for tag in self.tags:
             tag_lower = tag.lower().strip()
-            if tag_lower in PREDEFINED_TAGS:
+            if tag_lower in VALID_TAGS:
                 valid_tags.append(tag_lower)
             else:
                 invalid_tags.append(tag)
-        
+
         if invalid_tags:
             print(f"Warning: Invalid tags ignored: {invalid_tags}")
-        
+
         return valid_tags
-    
+
     def parse_to_crawler_configs(self) -> List[Dict[str, Any]]:
         """
         Parse tags and generate crawler configurations.
-        
+
         Returns:
             List of crawler configs with assigned tags and params
         """
-        if not self.validated_tags:
-            # Default to reddit if no valid tags
-            return [{
-                "crawler": "reddit",
-                "assigned_tags": []
-            }]
-        
-        # Collect mappings per crawler
-        crawler_data = defaultdict(lambda: {
-            "category_ids": set(),
-            "tags": [],
-            "max_priority": 0
-        })
-        
-        # Process each tag
-        for tag in self.validated_tags:
-            if tag not in TAG_MAPPINGS:
-                continue
-            
-            mappings = TAG_MAPPINGS[tag]
-            
-            for mapping in mappings:
-                crawler = mapping.crawler
-                
-                # Track the tag for this crawler
-                crawler_data[crawler]["tags"].append(tag)
-                
-                # Track category if present
-                if mapping.category_id:
-                    crawler_data[crawler]["category_ids"].add(mapping.category_id)
-                
-                # Track max priority
-                if mapping.priority > crawler_data[crawler]["max_priority"]:
-                    crawler_data[crawler]["max_priority"] = mapping.priority
-        
-        # Convert to final format
-        configs = []
-        
-        # Sort by priority (higher priority first)
-        sorted_crawlers = sorted(
-            crawler_data.items(),
-            key=lambda x: x[1]["max_priority"],
-            reverse=True
-        )
-        
-        for crawler, data in sorted_crawlers:
-            config = {
-                "crawler": crawler,
-                "assigned_tags": data["tags"]
-            }
-            
-            # Add params based on crawler type
-            if crawler == "youtube":
-                if data["category_ids"]:
-                    # YouTube can handle multiple category IDs
-                    config["params"] = {
-                        "category_ids": sorted(list(data["category_ids"]))
-                    }
-            elif crawler == "google_trends":
-                if data["category_ids"]:
-                    # Google Trends uses single category, pick the first one
-                    # (or you could pick based on tag priority)
-                    config["params"] = {
-                        "category_id": list(data["category_ids"])[0]
-                    }
-            elif crawler == "huggingface":
-                # HuggingFace uses search query
-                config["params"] = {
-                    "search_query": " ".join(data["tags"])
-                }
-            # Reddit doesn't need category params
-            
-            configs.append(config)
-        
-        return configs
-    
+        canonical = tuple(sorted(set(self.validated_tags)))
+        return [_materialize(config) for config in _compile_configs(canonical)]
+
     def get_all_tags(self) -> List[str]:
         """Get all validated tags"""
         return self.validated_tags
@@ -140,10 +182,10 @@ class TagParser:
 def parse_tags(tags: List[str]) -> List[Dict[str, Any]]:
     """
     Parse tags into crawler configurations.
-    
+
     Args:
         tags: List of predefined tags from LLM
-        
+
     Returns:
         List of crawler configurations
     """
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.const.tags import TAG_ALIASES
+from app.dedup import shingles
+from app.settings import settings
+from app.text import STOPWORDS, fold_text, tokenize
+from app.tools.tag_parser import TAG_INDEX, VALID_TAGS
+
+
+# Tags the resolver may return: predefined and routable to a crawler
+RESOLVABLE_TAGS: Tuple[str, ...] = tuple(sorted(VALID_TAGS & set(TAG_INDEX)))
+
+# Wide enough that distinct n-grams rarely share a bucket
+EMBEDDING_DIM = 4096
+# Shorter queries share too few n-grams with an alias to be told apart
+MIN_QUERY_SHINGLES = 3
+
+
+def _exact_tokens(text: str) -> Tuple[str, ...]:
+    """Lowercased NFC word tokens, keeping diacritics."""
+    text = unicodedata.normalize("NFC", text).lower()
+    return tuple("".join(c if c.isalnum() or c == "_" else " " for c in text).split())
+
+
+def _folded_tokens(text: str) -> Tuple[str, ...]:
+    return _exact_tokens(fold_text(text))
+
+
+def _embed(texts: List[str]) -> np.ndarray:
+    """L2-normalized hashed character 3-gram vectors."""
+    vectors = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        buckets = [zlib.crc32(gram.encode("utf-8")) % EMBEDDING_DIM for gram in shingles(text)]
+        np.add.at(vectors[row], buckets, 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+
+class TagResolver:
+    """
+    Map a free-text interest ("phim hài cuối tuần", "AI papers") to
+    predefined tags without an LLM round trip.
+
+    Aliases from ``TAG_ALIASES`` are compiled into phrase dictionaries, so
+    resolving scans the query's n-grams once: O(words * longest alias).
+    Input with diacritics matches aliases as written; accent-less input
+    matches folded multi-word aliases. When no alias matches, hashed
+    character n-gram embeddings of each tag's aliases catch near misses
+    and typos (a tag scores as its closest alias). Stopwords are dropped
+    first and very short queries get no fallback, since a couple of shared
+    n-grams say nothing. The alias vectors are cached on disk when
+    ``embeddings_path`` is set.
+    """
+
+    def __init__(self,
+                 aliases: Dict[str, List[str]],
+                 min_similarity: float,
+                 embeddings_path: Optional[str] = None):
+        self.aliases = {tag: aliases.get(tag, []) for tag in RESOLVABLE_TAGS}
+        self.min_similarity = min_similarity
+        self.embeddings_path = embeddings_path
+        self._exact: Dict[Tuple[str, ...], set] = defaultdict(set)
+        self._folded: Dict[Tuple[str, ...], set] = defaultdict(set)
+        self._embeddings: Optional[np.ndarray] = None
+        # One embedding per alias, mapped back to its tag
+        self._phrases = [
+            (tag, phrase)
+            for tag, phrases in self.aliases.items()
+            for phrase in dict.fromkeys([tag.replace("_", " "), *phrases])
+        ]
+        self._phrase_tags = np.array(
+            [RESOLVABLE_TAGS.index(tag) for tag, _ in self._phrases], dtype=np.intp
+        )
+
+        for tag, phrases in self.aliases.items():
+            for phrase in [tag, tag.replace("_", " "), *phrases]:
+                exact = _exact_tokens(phrase)
+                self._exact[exact].add(tag)
+                # Folding single Vietnamese syllables is too ambiguous
+                if phrase.isascii() or len(exact) > 1:
+                    self._folded[_folded_tokens(phrase)].add(tag)
+
+        self.max_phrase = max(len(phrase) for phrase in [*self._exact, *self._folded])
+
+    def _fingerprint(self) -> str:
+        payload = json.dumps([self.aliases, EMBEDDING_DIM], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _tag_embeddings(self) -> np.ndarray:
+        if self._embeddings is not None:
+            return self._embeddings
+
+        fingerprint = self._fingerprint()
+        if self.embeddings_path and os.path.exists(self.embeddings_path):
+            try:
+                with np.load(self.embeddings_path) as cached:
+                    if str(cached["fingerprint"]) == fingerprint:
+                        self._embeddings = cached["vectors"]
+                        return self._embeddings
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring tag embedding cache: {e}")
+
+        self._embeddings = _embed([phrase for _, phrase in self._phrases])
+        if self.embeddings_path:
+            try:
+                np.savez(self.embeddings_path, fingerprint=fingerprint, vectors=self._embeddings)
+            except OSError as e:
+                logger.warning(f"Could not cache tag embeddings: {e}")
+        return self._embeddings
+
+    def _match_phrases(self, text: str) -> Dict[str, float]:
+        folded_input = text.isascii()
+        tokens = _folded_tokens(text) if folded_input else _exact_tokens(text)
+        index = self._folded if folded_input else self._exact
+
+        scores: Dict[str, float] = defaultdict(float)
+        for start in range(len(tokens)):
+            for length in range(min(self.max_phrase, len(tokens) - start), 0, -1):
+                tags = index.get(tokens[start:start + length])
+                if tags:
+                    # Longer phrases are more specific
+                    for tag in tags:
+                        scores[tag] += length
+                    break
+        return scores
+
+    def resolve(self, text: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Predefined tags for a free-text interest, best first.
+
+        Returns:
+            (tag, score) pairs; alias matches score by matched words,
+            embedding matches by cosine similarity (below 1)
+        """
+        if not text or not text.strip():
+            return []
+
+        scores = self._match_phrases(text)
+        fallback = " ".join(token for token in tokenize(text) if token not in STOPWORDS)
+        if not scores and len(shingles(fallback)) >= MIN_QUERY_SHINGLES:
+            query = _embed([fallback])[0]
+            # A tag is as close as its closest alias
+            similarities = np.zeros(len(RESOLVABLE_TAGS), dtype=np.float32)
+            np.maximum.at(similarities, self._phrase_tags, self._tag_embeddings() @ query)
+            scores = {
+                RESOLVABLE_TAGS[i]: float(similarities[i])
+                for i in np.flatnonzero(similarities >= self.min_similarity)
+            }
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(tag, round(score, 3)) for tag, score in ranked[:limit]]
+
+    def resolve_tags(self, texts: List[str], limit: int = 5) -> List[str]:
+        """Predefined tags for several interests or loose tags, in first-seen order."""
+        tags = []
+        for text in texts:
+            tag = text.lower().strip()
+            if tag in RESOLVABLE_TAGS:
+                tags.append(tag)
+            else:
+                tags.extend(t for t, _ in self.resolve(text, limit))
+        return list(dict.fromkeys(tags))
+
+
+tag_resolver = TagResolver(
+    aliases=TAG_ALIASES,
+    min_similarity=settings.TAG_RESOLVER_MIN_SIMILARITY,
+    embeddings_path=settings.TAG_EMBEDDINGS_PATH
+)
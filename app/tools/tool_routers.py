@@ -1,4 +1,5 @@
-from app.const.tags import TAG_ROUTES
+from app.tools.tag_parser import parse_tags
+from app.tools.tag_resolver import tag_resolver
 
 
 class DetermineTags:
@@ -7,34 +8,16 @@ class DetermineTags:
 
     def determine_crawler_from_tags(self) -> dict:
         tags_lower = [t.lower() for t in self.tags]
-        
-        reddit_match = sum(1 for t in tags_lower if any(rt in t for rt in TAG_ROUTES["reddit"]))
-        youtube_match = sum(1 for t in tags_lower if any(yt in t for yt in TAG_ROUTES["youtube"]))
-        huggingface_match = sum(1 for t in tags_lower if any(hf in t for hf in TAG_ROUTES["huggingface"]))
-        both_match = sum(1 for t in tags_lower if any(bt in t for bt in TAG_ROUTES["both"]))
-        
-        crawlers = []
-        
-        if both_match > 0:
-            # Use all crawlers if "trending" or "popular" tags are present
-            crawlers = ["reddit", "youtube", "huggingface"]
-        elif huggingface_match >= 2:
-            crawlers = ["huggingface"]
-        elif youtube_match >= 2:
-            crawlers = ["youtube"]
-        elif reddit_match >= 2:
-            crawlers = ["reddit"]
-        elif huggingface_match > 0:
-            crawlers = ["huggingface", "reddit"]
-        elif youtube_match > 0:
-            crawlers = ["youtube", "reddit"]
-        else:
-            crawlers = ["reddit"]  # default to reddit
-        
+
+        # Loose tags and phrases resolve through the alias index in one pass
+        # each, then route through the precompiled tag index
+        resolved = tag_resolver.resolve_tags(tags_lower)
+        configs = parse_tags(resolved)
+
         return {
-            "crawlers": crawlers,
+            "tags": resolved,
+            "crawlers": [config["crawler"] for config in configs],
             "reddit_subreddit": tags_lower[0] if tags_lower else "all",
             "youtube_search_query": " ".join(tags_lower) if tags_lower else None,
             "huggingface_search_query": " ".join(tags_lower) if tags_lower else None
         }
-
@@ -1,14 +1,90 @@
-from app.schemas.posts import BasePost
+import dataclasses
+from typing import Callable, Optional
 
+from app.dedup import LSHIndex, MinHasher, canonical_url, jaccard, numbers, shingles
+from app.schemas.records import PostRecord
+from app.settings import settings
+
+
+_minhasher = MinHasher(num_perm=settings.DEDUP_MINHASH_PERMUTATIONS)
+
+
+def deduplicate_posts(
+    posts_list: list[PostRecord],
+    rank: Optional[Callable[[PostRecord], float]] = None
+) -> list[PostRecord]:
+    """
+    Collapse duplicate posts, across sources too.
+
+    Posts are grouped when they share a UID, a canonical URL, or a title
+    whose character 3-gram Jaccard similarity reaches
+    ``settings.DEDUP_TITLE_THRESHOLD`` (candidates from a MinHash LSH index,
+    so this stays sub-quadratic). Titles are only compared across sources
+    and must carry the same numbers, since one source lists episodes,
+    product generations and sibling papers as separate posts. Each group
+    keeps its best post by ``rank`` (the earliest one by default), with the
+    group's tags merged and the sources it absorbed listed in
+    ``merged_sources``.
+    """
+    parent = list(range(len(posts_list)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    rows = settings.DEDUP_MINHASH_PERMUTATIONS // settings.DEDUP_LSH_BANDS
+    lsh = LSHIndex(bands=settings.DEDUP_LSH_BANDS, rows=rows)
+    first_seen: dict[tuple[str, str], int] = {}
+    titles: dict[int, tuple[set[str], frozenset[str]]] = {}
+
+    for i, post in enumerate(posts_list):
+        for exact_key in (("uid", post.uid), ("url", canonical_url(post.url))):
+            if exact_key[1] is None:
+                continue
+            if exact_key in first_seen:
+                union(i, first_seen[exact_key])
+            else:
+                first_seen[exact_key] = i
+
+        grams = shingles(post.title or "")
+        if len(grams) < settings.DEDUP_MIN_SHINGLES:
+            # Too short to tell a repost from a different story
+            continue
+        digits = numbers(post.title)
+        signature = _minhasher.signature(grams)
+        for j in lsh.candidates(signature):
+            other_grams, other_digits = titles[j]
+            if (posts_list[j].source != post.source
+                    and other_digits == digits
+                    and jaccard(grams, other_grams) >= settings.DEDUP_TITLE_THRESHOLD):
+                union(i, j)
+        lsh.add(i, signature)
+        titles[i] = (grams, digits)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(posts_list)):
+        groups.setdefault(find(i), []).append(i)
 
-def deduplicate_posts(posts_list: list[BasePost]) -> list[BasePost]:
-    """Deduplicate posts based on their UID."""
-    seen_uids = set()
     unique_posts = []
-    
-    for post in posts_list:
-        if post.uid not in seen_uids:
-            seen_uids.add(post.uid)
-            unique_posts.append(post)
-    
-    return unique_posts
\ No newline at end of file
+    for members in groups.values():
+        if len(members) == 1:
+            unique_posts.append(posts_list[members[0]])
+            continue
+
+        best = max(members, key=lambda i: (rank(posts_list[i]) if rank else 0, -i))
+        group = [posts_list[i] for i in members]
+        # Cached posts are shared between responses, so copy instead of mutating
+        unique_posts.append(dataclasses.replace(
+            posts_list[best],
+            tags=sorted({tag for post in group for tag in post.tags}),
+            merged_sources=sorted({post.source for post in group})
+        ))
+
+    return unique_posts
@@ -0,0 +1,37 @@
+"""
+Microbenchmark for tag routing.
+
+    uv run python -m benchmarks.tag_parser
+"""
+import random
+import timeit
+
+from app.const.tags import PREDEFINED_TAGS
+from app.tools.tag_parser import _compile_configs, parse_tags
+
+
+def main(number: int = 20000) -> None:
+    random.seed(0)
+    samples = [random.sample(PREDEFINED_TAGS, random.randint(1, 6)) for _ in range(200)]
+
+    def run():
+        for tags in samples:
+            parse_tags(tags)
+
+    def cold():
+        _compile_configs.cache_clear()
+        run()
+
+    calls = len(samples)
+    rounds = max(number // calls, 1)
+
+    cold_time = min(timeit.repeat(cold, number=1, repeat=rounds))
+    warm_time = min(timeit.repeat(run, number=1, repeat=rounds))
+
+    print(f"parse_tags cold (compile): {cold_time / calls * 1e6:8.2f} us/call")
+    print(f"parse_tags warm (memoized): {warm_time / calls * 1e6:8.2f} us/call")
+    print(_compile_configs.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
+from fastmcp.tools.tool import ToolResult
 from app.crawlers import (
     RedditTrendingCrawler,
     YoutubeTrendingCrawler,
@@ -6,11 +7,29 @@ from app.crawlers import (
     SERPCrawler
 )
 from app.tools.tag_parser import parse_tags
-from app.const.tags import get_predefined_tags_prompt
-from app.schemas.posts import ToolResponse
+from app.tools.tag_resolver import tag_resolver
+from app.const.tags import get_predefined_tags_prompt, TAG_MAPPINGS
 from app.utils import deduplicate_posts
+from app.ranking import ranker
+from app.executor import FanOutExecutor, Job, SourceResult
+from app.cache import crawl_cache, crawl_listeners, response_cache, crawl_flight
+from app.quota import quota
+from app.resilience import circuit_breakers
+from app.serialization import tool_result
+from app.crawlers.serp import summary_cache
+from app.prefetch import PrefetchScheduler
+from app.store import trend_store
+from app.settings import settings
 from loguru import logger
-from typing import Any
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from collections import Counter
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Optional
+import asyncio
+import dataclasses
+import uvicorn
 
 # Initialize crawlers
 reddit_crawler = RedditTrendingCrawler()
@@ -18,8 +37,24 @@ youtube_crawler = YoutubeTrendingCrawler()
 hugging_crawler = HuggingFaceCrawler()
 google_crawler = SERPCrawler()
 
+executor = FanOutExecutor(
+    source_timeout=settings.SOURCE_TIMEOUT,
+    budget=settings.REQUEST_BUDGET,
+    timeouts=settings.SOURCE_TIMEOUTS
+)
+
+DEFAULT_REGION = "VN"
+DEFAULT_MAX_RESULTS = 5
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
 mcp = FastMCP("trending-crawlers")
 
+# Keep a local history of everything crawled
+if trend_store is not None:
+    crawl_listeners.append(trend_store.ingest)
+
 
 @mcp.tool()
 async def get_predefined_tags() -> dict:
@@ -48,9 +83,10 @@ async def get_predefined_tags() -> dict:
 @mcp.tool()
 async def process_interest(
     tags: list[str],
-    region_code: str = "VN",
-    max_results_per_crawler: int = 5,
-) -> dict:
+    region_code: str = DEFAULT_REGION,
+    max_results_per_crawler: int = DEFAULT_MAX_RESULTS,
+    top_k: Optional[int] = None,
+) -> ToolResult:
     """
     Process user interest and fetch trending content from appropriate crawlers.
     
@@ -61,114 +97,452 @@ async def process_interest(
               Example: ["politician", "movies", "climate", "discussion"]
         region_code: Region code for YouTube/Google (default: "VN")
         max_results_per_crawler: Maximum results per crawler (default: 20)
+        top_k: Return only the best k posts across crawlers (default:
+               settings.RANK_TOP_K, 0 returns every post)
         
     Returns:
-        Trending content from appropriate crawlers based on tags
+        Trending content from appropriate crawlers based on tags, best first,
+        with a per-source status/latency block under metadata["sources"]
     """
     if not tags:
-        return {
+        return tool_result({
             "error": "tags must be provided",
             "hint": "Call get_predefined_tags() to see available tags"
-        }
+        })
+    
+    jobs, metadata = _plan(tags, region_code, max_results_per_crawler)
+    results = await executor.run(jobs)
+
+    return tool_result(_respond(results, metadata, top_k))
+
+
+@mcp.tool()
+async def process_query(
+    query: str,
+    region_code: str = DEFAULT_REGION,
+    max_results_per_crawler: int = DEFAULT_MAX_RESULTS,
+    top_k: Optional[int] = None,
+) -> ToolResult:
+    """
+    Fetch trending content for a free-text interest.
+
+    Like process_interest, but the interest is resolved to predefined tags
+    locally (aliases incl. Vietnamese, then fuzzy matching), without asking
+    the LLM to pick tags first.
+
+    Args:
+        query: Free-text interest, e.g. "phim hài cuối tuần", "AI papers"
+        region_code: Region code for YouTube/Google (default: "VN")
+        max_results_per_crawler: Maximum results per crawler (default: 5)
+        top_k: Return only the best k posts across crawlers
+
+    Returns:
+        Same layout as process_interest, with the resolved tags and their
+        scores under metadata["resolved_tags"]
+    """
+    resolved = tag_resolver.resolve(query)
+    if not resolved:
+        return tool_result({
+            "error": f"No predefined tags match {query!r}",
+            "hint": "Rephrase the interest, or call get_predefined_tags() and use process_interest"
+        })
+
+    tags = [tag for tag, _ in resolved]
+    jobs, metadata = _plan(tags, region_code, max_results_per_crawler)
+    metadata["query"] = query
+    metadata["resolved_tags"] = dict(resolved)
+    results = await executor.run(jobs)
+
+    return tool_result(_respond(results, metadata, top_k))
+
+
+@mcp.tool()
+async def stream_interest(
+    tags: list[str],
+    ctx: Context,
+    region_code: str = DEFAULT_REGION,
+    max_results_per_crawler: int = DEFAULT_MAX_RESULTS,
+    include_data: bool = False,
+    top_k: Optional[int] = None,
+) -> ToolResult:
+    """
+    Streaming variant of process_interest.
+    
+    Posts are pushed to the client as soon as each crawler finishes, as a log
+    notification (logger "trending-crawlers.partial") whose extra payload
+    holds the source, status and posts, along with a progress notification.
+    The final result is a summary with totals and deduplication info.
     
+    Args:
+        tags: list of PREDEFINED tags (call get_predefined_tags() to see available tags)
+        region_code: Region code for YouTube/Google (default: "VN")
+        max_results_per_crawler: Maximum results per crawler (default: 5)
+        include_data: Also return the deduplicated posts in the final result,
+                      for clients that do not surface notifications
+        top_k: Keep only the best k posts in the final result (default:
+               settings.RANK_TOP_K, 0 keeps every post)
+        
+    Returns:
+        Summary of the run; includes the posts only when include_data is set
+    """
+    if not tags:
+        return tool_result({
+            "error": "tags must be provided",
+            "hint": "Call get_predefined_tags() to see available tags"
+        })
+
+    jobs, metadata = _plan(tags, region_code, max_results_per_crawler)
+
+    results = []
+    async for result in executor.stream(jobs):
+        results.append(result)
+        await ctx.report_progress(
+            progress=len(results),
+            total=len(jobs),
+            message=f"{result.source}: {result.status}, {len(result.data)} posts"
+        )
+        await ctx.log(
+            f"{result.source} returned {len(result.data)} posts",
+            logger_name="trending-crawlers.partial",
+            extra={
+                "source": result.source,
+                **result.summary(),
+                "data": [post.to_dict() for post in result.data],
+            }
+        )
+
+    response = _respond(results, metadata, top_k)
+    if not include_data:
+        response["data"] = []
+    return tool_result(response)
+
+
+@mcp.tool()
+async def process_interest_regions(
+    tags: list[str],
+    region_codes: list[str],
+    max_results_per_crawler: int = DEFAULT_MAX_RESULTS,
+    top_k: Optional[int] = None,
+) -> ToolResult:
+    """
+    Fetch trending content for several regions at once.
+    
+    Regions are fetched concurrently and share the crawler cache, so sources
+    without regional charts (Reddit, HuggingFace) are only crawled once.
+    
+    Args:
+        tags: list of PREDEFINED tags (call get_predefined_tags() to see available tags)
+        region_codes: ISO 3166-1 alpha-2 region codes, e.g. ["VN", "US", "JP"]
+        max_results_per_crawler: Maximum results per crawler and region (default: 5)
+        top_k: Best k posts kept per region (default: settings.RANK_TOP_K,
+               0 keeps every post)
+        
+    Returns:
+        One process_interest style response per region under "regions"
+    """
+    if not tags:
+        return tool_result({
+            "error": "tags must be provided",
+            "hint": "Call get_predefined_tags() to see available tags"
+        })
+
+    regions = list(dict.fromkeys(code.strip().upper() for code in region_codes if code.strip()))
+    if not regions:
+        return tool_result({"error": "region_codes must be provided"})
+
+    async def run_region(region_code: str) -> dict[str, Any]:
+        jobs, metadata = _plan(tags, region_code, max_results_per_crawler)
+        return _respond(await executor.run(jobs), metadata, top_k)
+
+    responses = await asyncio.gather(*(run_region(region) for region in regions))
+
+    return tool_result({
+        "regions": dict(zip(regions, responses)),
+        "total": sum(response["total"] for response in responses)
+    })
+
+
+@mcp.tool()
+async def query_trends(
+    tags: Optional[list[str]] = None,
+    sources: Optional[list[str]] = None,
+    hours: Optional[float] = 24,
+    text: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> ToolResult:
+    """
+    Browse trending posts already collected by earlier crawls, without
+    calling any upstream API.
+
+    Args:
+        tags: Only posts carrying any of these PREDEFINED tags
+        sources: Only posts from these sources: "youtube", "serp", "reddit", "hf"
+        hours: Only posts seen by a crawl in the last N hours (default: 24,
+               null for all history)
+        text: Substring to look for in the title or content, ignoring case
+              and diacritics ("bao" finds "Bão")
+        limit: Page size (default: 20, at most 100)
+        cursor: next_cursor from the previous page to continue browsing
+
+    Returns:
+        Stored posts, newest first, and next_cursor (null on the last page)
+    """
+    if trend_store is None:
+        return tool_result({"error": "trend store is disabled, set TREND_STORE_ENABLED=true"})
+
+    try:
+        posts, next_cursor = await trend_store.query(
+            tags=tags,
+            sources=sources,
+            hours=hours,
+            text=text,
+            limit=max(1, min(limit, MAX_PAGE_SIZE)),
+            cursor=cursor
+        )
+    except ValueError as e:
+        return tool_result({"error": str(e)})
+
+    return tool_result({
+        "data": [post.to_dict() for post in posts],
+        "total": len(posts),
+        "next_cursor": next_cursor
+    })
+
+
+@mcp.tool()
+async def search_trends(
+    query: str,
+    sources: Optional[list[str]] = None,
+    hours: Optional[float] = None,
+    limit: int = 10,
+) -> ToolResult:
+    """
+    Full-text search over titles and content of posts collected by earlier
+    crawls, e.g. "news about the typhoon" or "bão yagi". Accents are
+    optional, and no upstream API is called.
+
+    Args:
+        query: Free-text search; posts matching more (and rarer) words rank higher
+        sources: Only posts from these sources: "youtube", "serp", "reddit", "hf"
+        hours: Only posts seen by a crawl in the last N hours (default: all history)
+        limit: Maximum number of results (default: 10, at most 100)
+
+    Returns:
+        Matching posts, best match first, each with a BM25 "relevance"
+    """
+    if trend_store is None:
+        return tool_result({"error": "trend store is disabled, set TREND_STORE_ENABLED=true"})
+
+    matches = await trend_store.search(
+        query,
+        sources=sources,
+        hours=hours,
+        limit=max(1, min(limit, MAX_PAGE_SIZE))
+    )
+
+    return tool_result({
+        "data": [
+            {**post.to_dict(), "relevance": round(relevance, 4)}
+            for post, relevance in matches
+        ],
+        "total": len(matches)
+    })
+
+
+async def get_stats() -> ToolResult:
+    """
+    Process-wide diagnostics: crawl/LLM/HTTP cache counters, in-flight
+    call sharing, upstream quota, circuit breakers and the trend store.
+
+    Only registered as a tool when STATS_TOOL_ENABLED is set.
+    """
+    stats = {
+        "cache": crawl_cache.stats(),
+        "singleflight": crawl_flight.stats(),
+        "llm_cache": summary_cache.stats(),
+        "quota": quota.stats(),
+        "circuits": circuit_breakers.stats(),
+        "http_cache": response_cache.stats(),
+    }
+    if trend_store is not None:
+        stats["store"] = trend_store.stats()
+
+    return tool_result(stats)
+
+
+# Exposes cache sizes, hostnames and the store path, so it is opt-in
+if settings.STATS_TOOL_ENABLED:
+    mcp.tool()(get_stats)
+
+
+def _plan(
+    tags: list[str],
+    region_code: str,
+    max_results: int
+) -> tuple[dict[str, Job], dict[str, Any]]:
+    """Parse tags into crawler jobs and the initial response metadata"""
+    # One spelling per region, so "vn" and "VN" share cache entries
+    region_code = region_code.strip().upper() or DEFAULT_REGION
+
     # Parse tags into crawler configurations
     crawler_configs = parse_tags(tags)
     
     logger.info(f"Input tags: {tags}")
     logger.info(f"Generated {len(crawler_configs)} crawler configs")
     
-    all_data = []
     metadata = {
         "input_tags": tags,
         "region": region_code,
         "crawler_configs": crawler_configs
     }
-    
-    # Execute each crawler configuration
+
+    return _build_jobs(crawler_configs, region_code, max_results), metadata
+
+
+def _respond(
+    results: list[SourceResult],
+    metadata: dict[str, Any],
+    top_k: Optional[int] = None
+) -> dict[str, Any]:
+    """Merge per-source results into the ranked, deduplicated tool response"""
+    all_data = []
+    for result in results:
+        all_data.extend(result.data)
+
+    # Score before deduplicating so each group keeps its best post
+    scores = ranker.score(all_data, metadata["input_tags"])
+    score_by_post = {id(post): score for post, score in zip(all_data, scores.tolist())}
+    unique_posts = deduplicate_posts(all_data, rank=lambda post: score_by_post[id(post)])
+
+    top_k = settings.RANK_TOP_K if top_k is None else top_k
+    unique_scores = ranker.score(unique_posts, metadata["input_tags"])
+    ranked = [
+        dataclasses.replace(post, score=round(score, 4))
+        for score, post in ranker.top_k(unique_posts, unique_scores, top_k)
+    ]
+
+    metadata["sources"] = {result.source: result.summary() for result in results}
+    metadata["dedup"] = {
+        "before": len(all_data),
+        "after": len(unique_posts),
+        "removed": len(all_data) - len(unique_posts)
+    }
+    metadata["ranking"] = {"top_k": top_k, "returned": len(ranked)}
+
+    return {
+        "data": [post.to_dict() for post in ranked],
+        "total": len(all_data),
+        "metadata": metadata
+    }
+
+
+def _build_jobs(
+    crawler_configs: list[dict[str, Any]],
+    region_code: str,
+    max_results: int
+) -> dict[str, Job]:
+    """Turn crawler configs into zero-argument coroutine factories for the executor"""
+    jobs = {}
+
     for config in crawler_configs:
         crawler_name = config["crawler"]
         assigned_tags = config["assigned_tags"]
         params = config.get("params", {})
-        
-        logger.info(f"Executing {crawler_name} with tags: {assigned_tags}")
-        
-        try:
-            if crawler_name == "youtube":
-                results = await _fetch_youtube(
-                    max_results=max_results_per_crawler,
-                    category_ids=params.get("category_ids", []),
-                    tags=assigned_tags
-                )
-                all_data.extend(results)
-                
-            elif crawler_name == "google_trends":
-                results = await _fetch_google_trends(
-                    category_id=params.get("category_id"),
-                    tags=assigned_tags
-                )
-                all_data.extend(results)
-                
-            elif crawler_name == "reddit":
-                results = await _fetch_reddit(
-                    max_results=max_results_per_crawler,
-                    tags=assigned_tags
-                )
-                all_data.extend(results)
-                
-            elif crawler_name == "huggingface":
-                results = await _fetch_huggingface(
-                    tags=assigned_tags
-                )
-                all_data.extend(results)
-                
-        except Exception as e:
-            logger.error(f"Error fetching from {crawler_name}: {e}")
-            # Continue with other crawlers even if one fails
-    
-
-    return ToolResponse(
-        data=deduplicate_posts(all_data),
-        total=len(all_data),
-        metadata=metadata
-    )
+
+        logger.debug(f"Scheduling {crawler_name} with tags: {assigned_tags}")
+
+        if crawler_name == "youtube":
+            jobs[crawler_name] = partial(
+                _fetch_youtube,
+                region_code=region_code,
+                max_results=max_results,
+                category_ids=params.get("category_ids", []),
+                tags=assigned_tags
+            )
+        elif crawler_name == "google_trends":
+            jobs[crawler_name] = partial(
+                _fetch_google_trends,
+                region_code=region_code,
+                category_id=params.get("category_id"),
+                tags=assigned_tags
+            )
+        elif crawler_name == "reddit":
+            jobs[crawler_name] = partial(
+                _fetch_reddit,
+                max_results=max_results,
+                tags=assigned_tags
+            )
+        elif crawler_name == "huggingface":
+            jobs[crawler_name] = partial(
+                _fetch_huggingface,
+                max_results=max_results,
+                tags=assigned_tags
+            )
+
+    return jobs
+
+
+def _seed_jobs(region_code: str, max_results: int) -> list[Job]:
+    """
+    Single-tag crawls for the (crawler, category) pairs referenced most by
+    TAG_MAPPINGS, ordered by their summed priority. These are the requests
+    process_interest issues for one-tag queries, so they share cache keys.
+    """
+    weights = Counter()
+    seed_tags = {}
+
+    for tag, mappings in TAG_MAPPINGS.items():
+        for mapping in mappings:
+            # Reddit queries one subreddit per tag, the others one chart per category
+            combo = (mapping.crawler, tag if mapping.crawler == "reddit" else mapping.category_id)
+            weights[combo] += mapping.priority
+            seed_tags.setdefault(combo, tag)
+
+    jobs = []
+    for combo, _ in weights.most_common():
+        crawler_name = combo[0]
+        configs = [c for c in parse_tags([seed_tags[combo]]) if c["crawler"] == crawler_name]
+        jobs.extend(_build_jobs(configs, region_code, max_results).values())
+
+    return jobs
 
 
 async def _fetch_youtube(
+    region_code: str,
     max_results: int,
     category_ids: list[str],
     tags: list[str]
 ) -> list[dict[str, Any]]:
-    """Fetch from YouTube, potentially multiple calls for multiple categories"""
-    all_videos = []
-    
+    """Fetch from YouTube, splitting the budget across categories"""
     if category_ids:
-        # Fetch for each category
-        for category_id in category_ids:
-            logger.info(f"Fetching YouTube category {category_id}")
-            videos = await youtube_crawler.get_trending_videos(
-                max_results=max_results // len(category_ids),
-                category_id=category_id,
-                tags=tags
-            )
-            all_videos.extend(videos)
+        all_videos = await youtube_crawler.get_trending_by_categories(
+            category_ids=category_ids,
+            region_code=region_code,
+            max_results=max_results,
+            tags=tags
+        )
     else:
         # Fetch without category filter
-        videos = await youtube_crawler.get_trending_videos(
+        all_videos = await youtube_crawler.get_trending_videos(
+            region_code=region_code,
             max_results=max_results,
+            tags=tags
         )
-        all_videos.extend(videos)
     
     logger.info(f"YouTube returned {len(all_videos)} videos")
     return all_videos
 
 
 async def _fetch_google_trends(
+    region_code: str,
     category_id: str,
     tags: list[str]
 ) -> list[dict[str, Any]]:
     """Fetch from Google Trends"""
     trends = await google_crawler.get_trending_now(
         category_id=category_id,
+        region_code=region_code,
         tags=tags
     )
     
@@ -183,12 +557,11 @@ async def _fetch_reddit(
     max_results: int,
     tags: list[str]
 ) -> list[dict[str, Any]]:
-    """Fetch from Reddit"""
-    # Use first tag as subreddit or default to 'all'
-    subreddit = tags[0] if tags else "Vietnam"
+    """Fetch from Reddit, using every assigned tag as a subreddit"""
+    subreddits = tags or ["Vietnam"]
     
-    posts = await reddit_crawler.get_trending_posts(
-        subreddit_name=subreddit,
+    posts = await reddit_crawler.get_trending_posts_batch(
+        subreddit_names=subreddits,
         limit=max_results,
         tags=tags
     )
@@ -198,16 +571,67 @@ async def _fetch_reddit(
 
 
 async def _fetch_huggingface(
+    max_results: int,
     tags: list[str]
 ) -> list[dict[str, Any]]:
-    """Fetch from HuggingFace"""
+    """Fetch from HuggingFace, capped at HF_PAPERS_LIMIT papers"""
     papers = await hugging_crawler.get_trending_papers(
-        tags=tags
+        tags=tags,
+        limit=min(max_results, settings.HF_PAPERS_LIMIT)
     )
 
     logger.info(f"HuggingFace returned {len(papers)} papers")
     return papers
 
 
+prefetcher = PrefetchScheduler(
+    interval=settings.PREFETCH_INTERVAL,
+    top_n=settings.PREFETCH_TOP_N,
+    seeds=_seed_jobs(DEFAULT_REGION, DEFAULT_MAX_RESULTS),
+    concurrency=settings.PREFETCH_CONCURRENCY
+) if settings.PREFETCH_ENABLED else None
+
+
+async def close_resources() -> None:
+    """Release pooled crawler connections, the Reddit client, the LLM cache and the trend store."""
+    logger.info("Closing crawler HTTP sessions")
+    await asyncio.gather(
+        youtube_crawler.close(),
+        hugging_crawler.close(),
+        google_crawler.close(),
+        reddit_crawler.close(),
+        return_exceptions=True
+    )
+    summary_cache.close()
+    if trend_store is not None:
+        trend_store.close()
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    """
+    Process-wide lifespan of the HTTP app.
+
+    The optional prefetch scheduler is started and shared resources are
+    released here rather than in the MCP lifespan, which FastMCP enters once
+    per client session, so charts stay warm and pooled connections survive
+    between sessions.
+    """
+    async with mcp_app.lifespan(app):
+        if prefetcher is not None:
+            prefetcher.start()
+        try:
+            yield
+        finally:
+            if prefetcher is not None:
+                await prefetcher.stop()
+            await close_resources()
+
+
+mcp_app = mcp.http_app()
+# Serve with any ASGI server, e.g. `uvicorn main:app`
+app = Starlette(routes=[Mount("/", app=mcp_app)], lifespan=lifespan)
+
+
 if __name__ == "__main__":
-    mcp.run(transport="http")
\ No newline at end of file
+    uvicorn.run(app)
\ No newline at end of file
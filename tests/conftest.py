@@ -0,0 +1,9 @@
+import os
+import sys
+
+# app.settings requires the API credentials; tests never reach the real APIs
+for name in ("YOUTUBE_API_KEY", "REDDIT_CLIENT", "REDDIT_TOKEN", "SERP_TOKEN", "LLM_TOKEN"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("TREND_STORE_ENABLED", "false")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
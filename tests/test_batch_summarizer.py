@@ -0,0 +1,72 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.llm import BatchSummarizer, LangchainDeepSeek, LLMResponseCache
+
+
+class FakeCompletions:
+    """Answers batch prompts with the given ids, single prompts with one description."""
+
+    def __init__(self, batch_ids=None):
+        self.batch_ids = batch_ids
+        self.prompts = []
+
+    async def create(self, model, messages, temperature, max_tokens):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        if "JSON array" in prompt:
+            ids = self.batch_ids if self.batch_ids is not None else [
+                int(line.split(".", 1)[0]) for line in prompt.splitlines() if line[:1].isdigit()
+            ]
+            content = json.dumps([{"id": i, "description": f"batch {i}"} for i in ids])
+        else:
+            content = "single"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def summarizer(batch_ids=None):
+    llm = LangchainDeepSeek(api_key="test", cache=LLMResponseCache(ttl=60.0, max_entries=100))
+    completions = FakeCompletions(batch_ids)
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return BatchSummarizer(llm), completions
+
+
+def test_parse_keeps_expected_ids_with_descriptions():
+    content = (
+        'Here you go:\n```json\n[{"id": "0", "description": " first "},'
+        ' {"id": 1, "description": ""}, {"id": 7, "description": "unknown"},'
+        ' {"description": "no id"}, "junk"]\n```'
+    )
+    assert BatchSummarizer._parse(content, {0, 1}) == {0: "first"}
+    assert BatchSummarizer._parse("not json [", {0}) == {}
+    assert BatchSummarizer._parse('{"id": 0}', {0}) == {}
+
+
+def test_items_missing_from_batch_fall_back_to_single_calls():
+    batch, completions = summarizer(batch_ids=[0])
+
+    descriptions = asyncio.run(batch.summarize_many([["A"], ["B"], []]))
+
+    assert descriptions == ["batch 0", "single", ""]
+    assert len(completions.prompts) == 2
+
+
+def test_groups_are_cached_individually():
+    batch, completions = summarizer()
+
+    async def run():
+        first = await batch.summarize_many([["A"], ["B"]])
+        second = await batch.summarize_many([["A"], ["C"]])
+        third = await batch.summarize_many([["A"]])
+        single = await batch.summarize(["B"])
+        return first, second, third, single
+
+    first, second, third, single = asyncio.run(run())
+
+    assert first == ["batch 0", "batch 1"]
+    assert second == ["batch 0", "single"]
+    assert third == ["batch 0"]
+    assert single == "batch 1"
+    # One batch for A and B, one single call for C
+    assert len(completions.prompts) == 2
@@ -0,0 +1,59 @@
+from app.dedup import canonical_url
+from app.schemas.records import PostRecord
+from app.utils import deduplicate_posts
+
+
+def post(source: str, uid: str, title: str, url: str = None) -> PostRecord:
+    return PostRecord(source=source, uid=uid, title=title, author="someone", url=url, tags=[source])
+
+
+def test_canonical_url_collapses_youtube_links():
+    assert canonical_url("https://youtu.be/abc123?si=x") == "youtube:abc123"
+    assert canonical_url("https://www.youtube.com/watch?v=abc123&feature=share") == "youtube:abc123"
+    assert canonical_url("https://m.youtube.com/shorts/abc123/") == "youtube:abc123"
+
+
+def test_cross_source_reposts_are_merged():
+    posts = [
+        post("hf", "2501.1", "Qwen2.5-VL Technical Report"),
+        post("reddit", "t3_a", "[R] Qwen2.5-VL Technical Report"),
+        post("youtube", "v1", "Siêu bão Yagi đổ bộ Quảng Ninh"),
+        post("serp", "s1", "sieu bao yagi do bo quang ninh"),
+    ]
+    unique = deduplicate_posts(posts)
+
+    assert len(unique) == 2
+    assert unique[0].merged_sources == ["hf", "reddit"]
+    assert unique[0].tags == ["hf", "reddit"]
+    assert unique[1].merged_sources == ["serp", "youtube"]
+
+
+def test_same_source_merged_by_uid_and_url_only():
+    posts = [
+        post("youtube", "v1", "Some video", "https://www.youtube.com/watch?v=v1"),
+        post("youtube", "v1", "Some video (re-listed)"),
+        post("reddit", "t3_a", "Link one", "https://example.com/story?utm_source=x"),
+        post("reddit", "t3_b", "Link two", "https://example.com/story/"),
+    ]
+    assert len(deduplicate_posts(posts)) == 2
+
+
+def test_distinct_titles_are_kept():
+    posts = [
+        post("youtube", "v1", "Running Man Vietnam Mùa 3 - Tập 1"),
+        post("youtube", "v2", "Running Man Vietnam Mùa 3 - Tập 2"),
+        post("youtube", "v3", "iPhone 16 Pro Max review"),
+        post("reddit", "t3_a", "iPhone 17 Pro Max review"),
+        post("hf", "2502.1", "Qwen2.5-VL Technical Report"),
+        post("hf", "2502.2", "Qwen2.5-Omni Technical Report"),
+    ]
+    assert len(deduplicate_posts(posts)) == len(posts)
+
+
+def test_best_ranked_post_is_kept():
+    posts = [
+        post("serp", "s1", "Apple unveils the new MacBook Air lineup"),
+        post("reddit", "t3_a", "Apple unveils the new MacBook Air lineup!"),
+    ]
+    unique = deduplicate_posts(posts, rank=lambda p: 1.0 if p.source == "reddit" else 0.0)
+    assert [p.uid for p in unique] == ["t3_a"]
@@ -0,0 +1,66 @@
+import asyncio
+
+from app.executor import FanOutExecutor
+
+
+def _job(result=None, delay=0.0, exc=None):
+    async def job():
+        await asyncio.sleep(delay)
+        if exc is not None:
+            raise exc
+        return result
+    return job
+
+
+def _run(executor, jobs):
+    results = asyncio.run(executor.run(jobs))
+    return {result.source: result for result in results}
+
+
+def test_ok():
+    results = _run(FanOutExecutor(source_timeout=1.0, budget=2.0), {"a": _job(["post"])})
+
+    assert results["a"].status == "ok"
+    assert results["a"].data == ["post"]
+    assert results["a"].error is None
+
+
+def test_deadline_expiry_is_a_timeout():
+    executor = FanOutExecutor(source_timeout=1.0, budget=2.0, timeouts={"slow": 0.05})
+    results = _run(executor, {"slow": _job(["post"], delay=1.0), "fast": _job(["post"])})
+
+    assert results["slow"].status == "timeout"
+    assert results["slow"].error == "exceeded 0.05s deadline"
+    assert results["fast"].status == "ok"
+
+
+def test_job_errors_are_errors():
+    results = _run(FanOutExecutor(source_timeout=1.0, budget=2.0), {
+        "broken": _job(exc=ValueError("bad payload")),
+        # An upstream timeout raised well before our deadline is not ours
+        "upstream": _job(delay=0.01, exc=asyncio.TimeoutError()),
+    })
+
+    assert results["broken"].status == "error"
+    assert results["broken"].error == "bad payload"
+    assert results["upstream"].status == "error"
+    assert results["upstream"].error == "TimeoutError"
+
+
+def test_budget_exceeded_cancels_pending_jobs():
+    cancelled = []
+
+    async def stuck():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    executor = FanOutExecutor(source_timeout=5.0, budget=0.1)
+    results = _run(executor, {"stuck": stuck, "fast": _job(["post"])})
+
+    assert results["stuck"].status == "budget_exceeded"
+    assert results["stuck"].data == []
+    assert results["fast"].status == "ok"
+    assert cancelled == [True]
@@ -0,0 +1,47 @@
+import asyncio
+
+import main
+
+
+def test_plan_normalizes_region_code():
+    jobs, metadata = main._plan(["music"], " vn ", 5)
+    assert metadata["region"] == "VN"
+    assert {job.keywords["region_code"] for job in jobs.values() if "region_code" in job.keywords} == {"VN"}
+
+    _, metadata = main._plan(["music"], "", 5)
+    assert metadata["region"] == main.DEFAULT_REGION
+
+
+def test_huggingface_honours_max_results_up_to_the_cap(monkeypatch):
+    limits = []
+
+    async def get_trending_papers(tags, limit):
+        limits.append(limit)
+        return []
+
+    monkeypatch.setattr(main.hugging_crawler, "get_trending_papers", get_trending_papers)
+
+    for max_results in (5, main.settings.HF_PAPERS_LIMIT + 10):
+        asyncio.run(main._fetch_huggingface(max_results=max_results, tags=["ai"]))
+
+    assert limits == [5, main.settings.HF_PAPERS_LIMIT]
+
+    jobs, _ = main._plan(["ai"], "VN", 5)
+    assert jobs["huggingface"].keywords["max_results"] == 5
+
+
+def test_responses_leave_process_diagnostics_to_get_stats():
+    metadata = {"input_tags": ["ai"]}
+    response = main._respond([main.SourceResult("hf", "ok")], metadata)
+
+    assert set(response["metadata"]) == {"input_tags", "sources", "dedup", "ranking"}
+
+    stats = asyncio.run(main.get_stats()).structured_content
+    assert {"cache", "singleflight", "llm_cache", "quota", "circuits", "http_cache"} <= set(stats)
+
+
+def test_get_stats_is_opt_in():
+    tools = asyncio.run(main.mcp.get_tools())
+
+    assert "get_stats" not in tools
+    assert "process_interest" in tools
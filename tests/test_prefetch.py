@@ -0,0 +1,76 @@
+import asyncio
+
+from app.cache import CallRegistry, TTLCache
+from app.prefetch import PrefetchScheduler
+from app.quota import QuotaAccountant
+
+
+def scheduler(cache: TTLCache, registry: CallRegistry, quota: QuotaAccountant) -> PrefetchScheduler:
+    return PrefetchScheduler(interval=240.0, top_n=10, registry=registry, cache=cache, quota=quota)
+
+
+def test_only_entries_expiring_before_next_tick_are_refreshed():
+    cache = TTLCache(max_entries=10, default_ttl=300.0)
+    registry = CallRegistry(max_entries=10)
+    refreshed = []
+
+    def refresh(key):
+        async def job():
+            refreshed.append(key)
+        return job
+
+    cache.set(("hf", "fresh"), [1], ttl=1800.0)
+    cache.set(("hf", "expiring"), [1], ttl=60.0)
+    for key in (("hf", "fresh"), ("hf", "expiring"), ("hf", "missing")):
+        registry.record(key, refresh(key))
+
+    ran = asyncio.run(scheduler(cache, registry, QuotaAccountant({})).refresh_once())
+
+    assert ran == 2
+    assert sorted(refreshed) == [("hf", "expiring"), ("hf", "missing")]
+
+
+def test_sources_low_on_quota_are_skipped():
+    cache = TTLCache(max_entries=10, default_ttl=300.0)
+    registry = CallRegistry(max_entries=10)
+    quota = QuotaAccountant({"serp": 100}, reserve_ratio=0.1)
+    quota.charge("serp", "google_trends_trending_now")
+    refreshed = []
+
+    async def job():
+        refreshed.append("serp")
+
+    registry.record(("serp", "VN"), job)
+    prefetcher = scheduler(cache, registry, quota)
+
+    asyncio.run(prefetcher.refresh_once())
+    assert refreshed == ["serp"]
+
+    for _ in range(90):
+        quota.charge("serp", "google_trends_trending_now")
+    registry.record(("serp", "VN"), job)
+    asyncio.run(prefetcher.refresh_once())
+    assert refreshed == ["serp"]
+
+
+def test_seeds_only_warm_up_once_and_are_not_recorded():
+    from app.cache import cached, crawl_calls
+
+    fetched = []
+
+    @cached("test_seed", key=("name",))
+    async def fetch_chart(name: str) -> list[str]:
+        fetched.append(name)
+        return [name]
+
+    prefetcher = PrefetchScheduler(
+        interval=240.0, top_n=10, seeds=[lambda: fetch_chart("chart")],
+        registry=CallRegistry(max_entries=10), cache=TTLCache(max_entries=10, default_ttl=300.0),
+        quota=QuotaAccountant({})
+    )
+    calls_before = len(crawl_calls)
+
+    assert asyncio.run(prefetcher.refresh_once()) == 1
+    assert asyncio.run(prefetcher.refresh_once()) == 0
+    assert fetched == ["chart"]
+    assert len(crawl_calls) == calls_before
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.ranking import Ranker
+from app.schemas.records import PostRecord
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def post(source: str, uid: str, hours_ago=None, **metadata) -> PostRecord:
+    return PostRecord(
+        source=source, uid=uid, title=uid, author="someone", tags=["ai"],
+        created_at=NOW - timedelta(hours=hours_ago) if hours_ago is not None else None,
+        metadata=metadata
+    )
+
+
+def test_undated_posts_get_median_recency():
+    ranker = Ranker(weights={"recency": 1.0}, half_life_hours=24.0)
+    posts = [post("youtube", "a", 0), post("youtube", "b", 24), post("youtube", "c", 48), post("hf", "d")]
+
+    scores = ranker.score(posts, ["ai"], now=NOW.timestamp())
+
+    assert np.allclose(scores, [1.0, 0.5, 0.25, 0.5])
+
+
+def test_undated_source_does_not_take_over_mixed_batch():
+    ranker = Ranker(weights={"engagement": 0.5, "recency": 0.3, "tags": 0.2}, half_life_hours=24.0)
+    posts = (
+        [post("hf", f"hf{i}", upvotes=100 - i) for i in range(15)]
+        + [post("youtube", f"yt{i}", hours_ago=6 + 6 * i, view_count=10_000 - 100 * i) for i in range(5)]
+        + [post("reddit", f"rd{i}", hours_ago=6 + 6 * i, score=500 - 10 * i, upvote_ratio=0.9) for i in range(5)]
+    )
+
+    scores = ranker.score(posts, ["ai"], now=NOW.timestamp())
+    top = [p.source for _, p in Ranker.top_k(posts, scores, 10)]
+
+    # Treating undated papers as brand new gives them 8 of the 10 slots
+    assert top[0] == "youtube"
+    assert top.count("hf") <= 7
+    assert "reddit" in top
+
+
+def test_top_k_keeps_listing_order_on_ties():
+    posts = [post("serp", f"s{i}", 1) for i in range(4)]
+    best = Ranker.top_k(posts, np.array([0.5, 0.9, 0.5, 0.9]), 3)
+    assert [p.uid for _, p in best] == ["s1", "s3", "s0"]
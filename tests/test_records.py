@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from app.schemas.records import PostRecord
+
+
+def test_to_dict_layout():
+    post = PostRecord(
+        source="reddit",
+        uid="abc",
+        title="Title",
+        author="someone",
+        created_at=datetime(2024, 5, 1, 12, 0),
+        metadata={"score": 10},
+    )
+
+    assert post.to_dict() == {
+        "source": "reddit",
+        "uid": "abc",
+        "title": "Title",
+        "content": None,
+        "author": "someone",
+        "url": None,
+        "tags": [],
+        "created_at": "2024-05-01T12:00:00",
+        "metadata_": {"score": 10},
+        "merged_sources": [],
+        "score": None,
+    }
+
+
+def test_to_dict_keeps_unknown_created_at_null():
+    post = PostRecord(source="serp", uid="x", title="t", author="")
+
+    assert post.to_dict()["created_at"] is None
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from app.crawlers.base import MyDummyClass
+from app.resilience import CircuitBreaker, CircuitOpenError, circuit_breakers
+from app.settings import settings
+
+
+def test_breaker_opens_after_threshold_and_recovers():
+    breaker = CircuitBreaker("example.com", failure_threshold=2, recovery_timeout=0.0)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_abandoned_trial_reopens_circuit():
+    breaker = CircuitBreaker("example.com", failure_threshold=1, recovery_timeout=60.0)
+    breaker.record_failure()
+    breaker.recovery_timeout = 0.0
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+    breaker.record_abandoned()
+    assert breaker.state == "open"
+    breaker.recovery_timeout = 60.0
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_cancelled_trial_does_not_wedge_circuit(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_MAX_RETRIES", 0)
+    responses = iter(["unavailable", "slow", "ok"])
+
+    async def handler(request):
+        response = next(responses)
+        if response == "unavailable":
+            return web.Response(status=503)
+        if response == "slow":
+            await asyncio.sleep(1)
+        return web.json_response({"ok": True})
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        client = MyDummyClass(f"http://127.0.0.1:{port}", {})
+        breaker = circuit_breakers.for_host("127.0.0.1")
+        breaker.failure_threshold = 1
+        breaker.recovery_timeout = 0.0
+        try:
+            with pytest.raises(Exception):
+                await client.get("/")
+            assert breaker.state == "open"
+
+            # The trial request is cut off by the caller's deadline
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get("/"), timeout=0.2)
+            assert breaker.state == "open"
+
+            assert await client.get("/") == {"ok": True}
+            assert breaker.state == "closed"
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(scenario())
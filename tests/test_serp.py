@@ -0,0 +1,9 @@
+from app.crawlers.serp import SERPCrawler
+
+
+def test_trend_uid_is_stable_across_searches():
+    item = {"query": "Bão  Yagi", "start_timestamp": 1725000000, "news_page_token": "a"}
+    again = {"query": "bão yagi", "start_timestamp": 1725000000, "news_page_token": "b"}
+
+    assert SERPCrawler._trend_uid("vn", item) == SERPCrawler._trend_uid("VN", again) == "VN_bão yagi_1725000000"
+    assert SERPCrawler._trend_uid("US", item) != SERPCrawler._trend_uid("VN", item)
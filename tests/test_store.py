@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.schemas.records import PostRecord
+from app.store import TrendStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TrendStore(path=str(tmp_path / "trends.sqlite3"), retention=24 * 60 * 60.0)
+    yield store
+    store.close()
+
+
+def post(uid: str, title: str, tags: list[str], hours_ago: int = 0, **fields) -> PostRecord:
+    return PostRecord(
+        source="youtube", uid=uid, title=title, author="someone", tags=tags,
+        created_at=datetime.now() - timedelta(hours=hours_ago), **fields
+    )
+
+
+def test_ingest_upserts_and_accumulates_tags(store):
+    asyncio.run(store.ingest([post("v1", "Bão Yagi đổ bộ", ["news"], metadata={"view_count": 1})]))
+    asyncio.run(store.ingest([post("v1", "Bão Yagi đổ bộ Quảng Ninh", ["climate"], metadata={"view_count": 2})]))
+
+    posts, cursor = asyncio.run(store.query())
+    assert cursor is None
+    assert len(posts) == 1
+    assert posts[0].title == "Bão Yagi đổ bộ Quảng Ninh"
+    assert posts[0].tags == ["climate", "news"]
+    assert posts[0].metadata == {"view_count": 2}
+
+
+def test_query_paginates_newest_first(store):
+    asyncio.run(store.ingest([post(f"v{i}", f"Video {i}", ["music"], hours_ago=i) for i in range(5)]))
+
+    first, cursor = asyncio.run(store.query(tags=["music"], limit=3))
+    second, last = asyncio.run(store.query(tags=["music"], limit=3, cursor=cursor))
+
+    assert [p.uid for p in first] == ["v0", "v1", "v2"]
+    assert [p.uid for p in second] == ["v3", "v4"]
+    assert last is None
+
+
+def test_search_folds_diacritics(store):
+    asyncio.run(store.ingest([
+        post("v1", "Siêu bão Yagi đổ bộ", ["news"]),
+        post("v2", "Transformers explained", ["ai"]),
+    ]))
+
+    matches = asyncio.run(store.search("bao yagi"))
+    assert [p.uid for p, _ in matches] == ["v1"]
+    assert [p.uid for p, _ in asyncio.run(store.search("transformer"))] == ["v2"]
+
+
+def test_text_filter_ignores_case_and_diacritics(store):
+    asyncio.run(store.ingest([
+        post("v1", "Bão Yagi đổ bộ", ["news"]),
+        post("v2", "100% pure_music", ["music"], content=None),
+    ]))
+
+    for text in ("BÃO", "bão", "bao yagi", "ĐỔ BỘ"):
+        posts, _ = asyncio.run(store.query(text=text))
+        assert [p.uid for p in posts] == ["v1"], text
+    assert [p.uid for p in asyncio.run(store.query(text="100%"))[0]] == ["v2"]
+    assert asyncio.run(store.query(text="pure%music"))[0] == []
+
+
+def test_zero_hours_is_not_all_history(store):
+    asyncio.run(store.ingest([post("v1", "Some video", ["music"])]))
+
+    assert len(asyncio.run(store.query(hours=None))[0]) == 1
+    assert asyncio.run(store.query(hours=0))[0] == []
@@ -0,0 +1,49 @@
+import pytest
+
+from app.const.tags import TAG_ALIASES
+from app.tools.tag_resolver import TagResolver
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return TagResolver(aliases=TAG_ALIASES, min_similarity=0.6)
+
+
+def tags(resolver, text):
+    return [tag for tag, _ in resolver.resolve(text)]
+
+
+def test_aliases_match_english_and_vietnamese(resolver):
+    assert tags(resolver, "AI papers on arxiv") == ["paper", "ai"]
+    assert tags(resolver, "phim hài cuối tuần") == ["comedy"]
+    assert tags(resolver, "chó mèo dễ thương") == ["pets"]
+    assert tags(resolver, "stock market crash") == ["finance"]
+
+
+def test_accentless_input_matches_folded_aliases(resolver):
+    assert tags(resolver, "tin tuc the thao") == ["news", "sports"]
+    assert tags(resolver, "gia vang") == ["finance"]
+
+
+def test_typos_fall_back_to_embeddings(resolver):
+    assert tags(resolver, "musics") == ["music"]
+    assert tags(resolver, "machine lerning") == ["machine_learning"]
+
+
+@pytest.mark.parametrize("text", ["", "xyzzy qwerty", "bạn", "the", "abc", "catherine", "hello world"])
+def test_unrelated_text_resolves_to_nothing(resolver, text):
+    assert resolver.resolve(text) == []
+
+
+def test_resolve_tags_keeps_known_tags_and_order(resolver):
+    assert resolver.resolve_tags(["Music", "tin tuc the thao", "music"]) == ["music", "news", "sports"]
+
+
+def test_embeddings_are_cached_on_disk(tmp_path):
+    path = str(tmp_path / "tags.npz")
+    first = TagResolver(aliases=TAG_ALIASES, min_similarity=0.6, embeddings_path=path)
+    assert first.resolve("musics") == [("music", 0.866)]
+
+    second = TagResolver(aliases=TAG_ALIASES, min_similarity=0.6, embeddings_path=path)
+    assert second.resolve("musics") == [("music", 0.866)]
+    assert (tmp_path / "tags.npz").exists()